@@ -0,0 +1,36 @@
+import time
+from search.Problems import StreetProblem, MazeProblem
+from search.strategies import AStar
+from search.GraphSearch import GraphSearch
+from search.ARAStar import ARAStar
+from search.Environments import random_roads, random_maze
+
+map = random_roads(50000, seed=0)
+map_problem = StreetProblem(environment=map,
+                            initial_state='City 0',
+                            goal_state='City 49999')
+maze = random_maze(300, 300, 0.3, seed=42)
+maze_problem = MazeProblem(environment=maze,
+                           initial_state=(0, 0),
+                           goal_state=(299, 299))
+
+
+def report(node, bound):
+    print(f'\t\tsolution of cost {node.cost:.2f}, at most {bound:.3f} times the optimal one')
+
+
+for name, problem in [('Random map, 50000 cities', map_problem), ('Maze 300x300', maze_problem)]:
+    print(name)
+    for weight in [1, 3]:
+        search = GraphSearch(problem=problem, strategy=AStar(problem, weight=weight))
+        start = time.perf_counter()
+        result, node = search.run()
+        print(f'\t{search.strategy}: {result}, cost {node.cost:.2f}, expanded nodes {search.expanded}, '
+              f'time {time.perf_counter() - start:.2f}s')
+    for deadline in [None, 0.1]:
+        search = ARAStar(problem=problem, deadline=deadline, callback=report)
+        print(f'\t{search}, deadline {deadline}:')
+        result, node = search.run()
+        for cost, bound, seconds in search.history:
+            print(f'\t\tcost {cost:.2f}, bound {bound:.3f} after {seconds:.3f}s')
+        print(f'\t\t{result}, cost {node.cost:.2f}, bound {search.bound:.3f}, expanded nodes {search.expanded}')
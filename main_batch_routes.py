@@ -0,0 +1,34 @@
+import random
+import time
+from search.Problems import StreetProblem
+from search.strategies import AStar
+from search.GraphSearch import GraphSearch
+from search.batch_routes import BatchRouter
+from search.Environments import random_roads
+
+# a batch of queries on a random map, with some repeated queries
+random.seed(0)
+map = random_roads(5000, seed=0)
+cities = list(map.streets)
+distinct = [(random.choice(cities), random.choice(cities)) for _ in range(400)]
+queries = [random.choice(distinct) for _ in range(1000)]
+
+start = time.perf_counter()
+for initial_state, goal_state in queries[:100]:
+    problem = StreetProblem(environment=map, initial_state=initial_state, goal_state=goal_state)
+    GraphSearch(problem=problem, strategy=AStar(problem)).run()
+sequential = (time.perf_counter() - start) / 100
+print(f'Sequential Graph Search, AStar: {sequential * 1000:.2f}ms per query')
+
+with BatchRouter(map, processes=4) as router:
+    start = time.perf_counter()
+    first = None
+    for i, (initial_state, goal_state, result, path, cost, seconds) in enumerate(router.map(queries)):
+        if first is None:
+            first = time.perf_counter() - start
+        if i < 3:
+            print(f'\t{initial_state} -> {goal_state}: {result}, cost {cost:.2f}, {len(path)} cities, '
+                  f'{seconds * 1000:.2f}ms')
+    elapsed = time.perf_counter() - start
+print(f'Batch of {len(queries)} queries ({len(set(queries))} distinct): first answer after {first * 1000:.1f}ms, '
+      f'{elapsed / len(queries) * 1000:.2f}ms per query')
@@ -0,0 +1,20 @@
+import os
+import sys
+import tempfile
+from search.benchmark import maze_benchmark, save_report
+
+# size sweep of random solvable mazes (same seed -> same mazes, so the reports are comparable across releases)
+sizes = [10, 20, 40, 80]
+density = 0.2
+seed = 0
+# the report goes to the temporary directory unless a path is given, so that runs leave no files in the repository
+output = sys.argv[1] if len(sys.argv) > 1 else os.path.join(tempfile.gettempdir(), 'benchmark_report.json')
+
+records = maze_benchmark(sizes, density=density, seed=seed)
+save_report(records, output, sizes=sizes, density=density, seed=seed)
+
+print(f'{"size":>6} {"strategy":<30} {"result":<6} {"cost":>6} {"time (s)":>10} {"expanded":>10} {"max fringe":>10} {"memory (KB)":>12}')
+for r in records:
+    print(f'{r["size"]:>6} {r["strategy"]:<30} {r["result"]:<6} {str(r["cost"]):>6} {r["seconds"]:>10.4f} '
+          f'{r["expanded"]:>10} {r["max_fringe"]:>10} {r["peak_memory"] / 1024:>12.1f}')
+print(f'Report saved to {output}')
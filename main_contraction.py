@@ -0,0 +1,45 @@
+import random
+import time
+from search.Problems import StreetProblem
+from search.strategies import AStar
+from search.GraphSearch import GraphSearch
+from search.ContractionHierarchy import ContractionHierarchy, ContractionHierarchySearch
+from search.Environments import streets, streets_coords, Roads, random_roads
+
+# a single query on the Apulian map
+map = Roads(streets, streets_coords)
+hierarchy = ContractionHierarchy(map)
+hierarchy.preprocess()
+map_problem = StreetProblem(environment=map,
+                            initial_state='Andria',
+                            goal_state='Bari')
+search = ContractionHierarchySearch(problem=map_problem, hierarchy=hierarchy)
+result, node = search.run()
+print(search)
+print(result)
+print(node.path())
+print(node.cost)
+
+print("---------")
+
+# query latency on random maps: contraction hierarchy vs Graph Search with AStar
+random.seed(0)
+n_queries = 200
+for n_cities in [500, 2000, 5000]:
+    map = random_roads(n_cities, seed=0)
+    start = time.perf_counter()
+    hierarchy = ContractionHierarchy(map)
+    hierarchy.preprocess()
+    preprocessing = time.perf_counter() - start
+    print(f'{n_cities} cities: preprocessing {preprocessing:.2f}s, {hierarchy.shortcuts} shortcuts')
+
+    cities = list(map.streets)
+    queries = [(random.choice(cities), random.choice(cities)) for _ in range(n_queries)]
+    problems = [StreetProblem(environment=map, initial_state=a, goal_state=b) for a, b in queries]
+    for name, make_search in [('Graph Search, AStar', lambda p: GraphSearch(problem=p, strategy=AStar(p))),
+                              ('Contraction Hierarchy', lambda p: ContractionHierarchySearch(problem=p, hierarchy=hierarchy))]:
+        start = time.perf_counter()
+        for problem in problems:
+            make_search(problem).run()
+        latency = (time.perf_counter() - start) / n_queries
+        print(f'\t{name}: {latency * 1000:.3f} ms per query')
@@ -0,0 +1,49 @@
+import random
+import time
+from search.Problems import MazeProblem
+from search.strategies import AStar
+from search.GraphSearch import GraphSearch
+from search.DStarLite import DStarLite
+from search.Environments import random_maze
+
+# an agent walks through a maze whose walls change while it moves:
+# D* Lite repairs its plan, Graph Search with AStar plans again from scratch
+random.seed(0)
+density = 0.25
+n_changes = 3  # <- walls added and removed after each move
+
+for size in [50, 100, 200]:
+    maze = random_maze(size, size, density, seed=42)
+    maze_problem = MazeProblem(environment=maze,
+                               initial_state=(0, 0),
+                               goal_state=(size - 1, size - 1))
+    search = DStarLite(problem=maze_problem)
+    start = time.perf_counter()
+    result, node = search.run()
+    first = time.perf_counter() - start
+
+    replan, full, moves = 0.0, 0.0, 0
+    while result == 'Ok' and node.depth > 0 and moves < 100:
+        # move along the plan, then change some walls near the agent
+        path = node.path()
+        state = maze_problem.result(maze_problem.initial_state, path[0])
+        search.move(state)
+        moves += 1
+        cells = [(random.randrange(max(0, state[0] - 5), min(size, state[0] + 6)),
+                  random.randrange(max(0, state[1] - 5), min(size, state[1] + 6))) for _ in range(2 * n_changes)]
+        cells = [c for c in cells if c != state and c != maze_problem.goal_state]
+        search.update_walls(added=cells[:n_changes], removed=cells[n_changes:])
+
+        start = time.perf_counter()
+        result, node = search.run()
+        replan += time.perf_counter() - start
+
+        scratch = GraphSearch(problem=maze_problem, strategy=AStar(maze_problem))
+        start = time.perf_counter()
+        check, other = scratch.run()
+        full += time.perf_counter() - start
+        assert check == result and (result == 'Fail' or other.cost == node.cost)
+
+    print(f'Maze {size}x{size}: first plan {first * 1000:.1f}ms, {moves} moves, '
+          f'replanning {replan / max(moves, 1) * 1000:.2f}ms per move, '
+          f'Graph Search, AStar {full / max(moves, 1) * 1000:.2f}ms per move')
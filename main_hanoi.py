@@ -1,6 +1,9 @@
-from search.Problems import HanoiTower
+import random
+import time
+from search.Problems import HanoiTower, CompactHanoiTower
 from search.strategies import *
 from search.GraphSearch import GraphSearch
+from search.iterative_deepening import IterativeDeepening, IDAStar
 
 problem = HanoiTower(n=3)
 
@@ -19,4 +22,39 @@ for strategy in strategies:
 
 print("---------")
 
+for search in [IterativeDeepening(problem=problem), IDAStar(problem=problem)]:
+    result, node = search.run()
+    print(search)
+    print(result)
+    print(f'(limit, expanded nodes) per iteration: {search.iterations}')
+    try:
+        print(node.path())
+        print(node.cost)
+    except AttributeError:
+        pass
+
+print("---------")
+
+# compact states (one base-k digit per disk) and pattern databases: 3 pegs, then 4 pegs
+problems = [(HanoiTower(n=8), 'lists of lists'),
+            (CompactHanoiTower(n=8, pegs=3), 'compact'),
+            (CompactHanoiTower(n=10, pegs=4), 'compact, 4 pegs')]
+for problem, name in problems:
+    search = GraphSearch(problem=problem, strategy=AStar(problem))
+    start = time.perf_counter()
+    result, node = search.run()
+    elapsed = time.perf_counter() - start
+    print(f'{problem.n} disks, {name}: {result}, cost {node.cost}, expanded nodes {search.expanded}, '
+          f'time {elapsed:.2f}s')
 
+# a scrambled 16 disks tower on 4 pegs
+random.seed(0)
+problem = CompactHanoiTower(n=16, pegs=4)
+state = problem.goal_state
+for _ in range(500):
+    state, _ = random.choice(problem.successors(state))
+problem.initial_state = state
+search = GraphSearch(problem=problem, strategy=AStar(problem))
+result, node = search.run()
+print(f'16 disks, 4 pegs, from {problem.decode(state)}: {result}, cost {node.cost}, expanded nodes {search.expanded}')
+print(node.path())
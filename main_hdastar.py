@@ -0,0 +1,28 @@
+import os
+import time
+from search.Problems import MazeProblem, CompactHanoiTower
+from search.strategies import AStar
+from search.GraphSearch import GraphSearch
+from search.HDAStar import HDAStar
+from search.Environments import random_maze
+
+maze = random_maze(300, 300, 0.25, seed=42)
+maze_problem = MazeProblem(environment=maze,
+                           initial_state=(0, 0),
+                           goal_state=(299, 299))
+hanoi_problem = CompactHanoiTower(n=9, pegs=4, pattern_sizes=[5, 4])
+
+print(f'{os.cpu_count()} cores')
+for name, problem in [('Maze 300x300', maze_problem), ('Hanoi, 9 disks, 4 pegs', hanoi_problem)]:
+    print(name)
+    search = GraphSearch(problem=problem, strategy=AStar(problem))
+    start = time.perf_counter()
+    result, node = search.run()
+    print(f'\tGraph Search, AStar: {result}, cost {node.cost}, expanded nodes {search.expanded}, '
+          f'time {time.perf_counter() - start:.2f}s')
+    for workers in [1, 2, 4, 8]:
+        search = HDAStar(problem=problem, workers=workers)
+        start = time.perf_counter()
+        result, node = search.run()
+        print(f'\t{search}, {workers} workers: {result}, cost {node.cost}, expanded nodes {search.loads}, '
+              f'time {time.perf_counter() - start:.2f}s')
@@ -0,0 +1,51 @@
+import random
+import time
+from search.Problems import MazeProblem
+from search.strategies import AStar
+from search.GraphSearch import GraphSearch
+from search.HierarchicalSearch import MazeAbstraction, HierarchicalSearch
+from search.Environments import random_maze
+
+# route queries on large mazes: HPA* on a cached abstraction vs Graph Search with AStar
+random.seed(0)
+density = 0.25
+n_queries = 5
+
+for size in [200, 500, 1000]:
+    maze = random_maze(size, size, density, seed=42)
+    abstraction = MazeAbstraction(maze, cluster_size=16)
+    start = time.perf_counter()
+    abstraction.preprocess()
+    preprocessing = time.perf_counter() - start
+    print(f'Maze {size}x{size}: preprocessing {preprocessing:.2f}s, {abstraction.builds} clusters')
+
+    free = [(r, c) for r in range(size) for c in range(size) if maze.is_free((r, c))]
+    queries = [(random.choice(free), random.choice(free)) for _ in range(n_queries)]
+    for name, make_search in [('Graph Search, AStar', lambda p: GraphSearch(problem=p, strategy=AStar(p))),
+                              ('HPA*', lambda p: HierarchicalSearch(problem=p, abstraction=abstraction))]:
+        elapsed, cost = 0.0, 0
+        for initial_state, goal_state in queries:
+            maze_problem = MazeProblem(environment=maze,
+                                       initial_state=initial_state,
+                                       goal_state=goal_state)
+            search = make_search(maze_problem)
+            start = time.perf_counter()
+            result, node = search.run()
+            elapsed += time.perf_counter() - start
+            cost += node.cost if result == 'Ok' else 0
+        print(f'\t{name}: {elapsed / n_queries * 1000:.1f}ms per query, total cost {cost}')
+
+    # changing some walls only drops the clusters around them
+    builds = abstraction.builds
+    for cell in random.sample(free, 20):
+        maze.add_wall(cell)
+    initial_state, goal_state = queries[0]
+    maze.remove_wall(initial_state)
+    maze.remove_wall(goal_state)
+    maze_problem = MazeProblem(environment=maze,
+                               initial_state=initial_state,
+                               goal_state=goal_state)
+    start = time.perf_counter()
+    result, node = HierarchicalSearch(problem=maze_problem, abstraction=abstraction).run()
+    elapsed = time.perf_counter() - start
+    print(f'\tafter 20 new walls: {result}, {abstraction.builds - builds} clusters rebuilt, {elapsed * 1000:.1f}ms')
@@ -0,0 +1,27 @@
+import time
+from search.Problems import MazeProblem
+from search.strategies import AStar
+from search.GraphSearch import GraphSearch
+from search.JumpPointSearch import JumpPointSearch
+from search.Environments import random_maze
+
+# large open mazes: a few scattered walls
+density = 0.02
+
+for size in [50, 100, 200, 400]:
+    initial_state = (0, 0)
+    goal_state = (size - 1, size - 1)
+    maze = random_maze(size, size, density, seed=42, solvable=False)
+    maze_problem = MazeProblem(environment=maze,
+                               initial_state=initial_state,
+                               goal_state=goal_state)
+
+    print(f'Maze {size}x{size}, {maze.n_walls} walls')
+    for search in [GraphSearch(problem=maze_problem, strategy=AStar(maze_problem)), JumpPointSearch(problem=maze_problem)]:
+        start = time.perf_counter()
+        result, node = search.run()
+        elapsed = time.perf_counter() - start
+        try:
+            print(f'\t{search}: {result}, cost {node.cost}, expanded nodes {search.expanded}, time {elapsed:.3f}s')
+        except AttributeError:
+            print(f'\t{search}: {result}, expanded nodes {search.expanded}, time {elapsed:.3f}s')
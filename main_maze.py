@@ -2,6 +2,8 @@ from search.Problems import MazeProblem
 from search.strategies import *
 from search.TreeSearch import TreeSearch
 from search.GraphSearch import GraphSearch
+from search.BidirectionalSearch import BidirectionalSearch
+from search.WavefrontSearch import WavefrontSearch
 from search.Environments import Maze
 
 
@@ -87,3 +89,18 @@ for strategy in strategies:
         print_grid(height, width, p_walls, initial_state, goal_state, node.path())
     except AttributeError:
         pass
+
+print("---------")
+
+# bidirectional search (Uniform Cost / AStar) and breadth first search computed on the whole grid at once
+for search in [BidirectionalSearch(problem=maze_problem), BidirectionalSearch(problem=maze_problem, heuristic=True),
+               WavefrontSearch(problem=maze_problem)]:
+    result, node = search.run()
+    print(search)
+    print(result)
+    try:
+        print(node.path())
+        print(node.cost)
+        print_grid(height, width, p_walls, initial_state, goal_state, node.path())
+    except AttributeError:
+        pass
@@ -0,0 +1,31 @@
+import os
+import tempfile
+import time
+from search.Problems import CompactHanoiTower
+from search.strategies import AStar, Greedy
+from search.GraphSearch import GraphSearch
+from search.pattern_database import PatternDatabase, additive, maximum
+
+problem = CompactHanoiTower(n=10, pegs=4)
+
+# two partitions of the disks, each giving a pair of disjoint pattern databases
+heuristics = []
+for sizes in [(6, 4), (4, 6)]:
+    databases, first = [], 0
+    for size in sizes:
+        abstract_problem, abstraction = problem.pattern(first, size)
+        path = os.path.join(tempfile.gettempdir(), f'hanoi_{problem.pegs}_pegs_{first}_{size}.npy')
+        PatternDatabase.build(abstract_problem, problem.pegs ** size, abstraction).save(path)
+        # the saved distances are memory-mapped
+        databases.append(PatternDatabase.load(path, abstraction))
+        first += size
+    heuristics.append((f'additive {sizes}', additive(*databases)))
+heuristics.append(('max of the two', maximum(heuristics[0][1], heuristics[1][1])))
+
+for name, h in heuristics:
+    for strategy in [AStar(problem, h=h), Greedy(problem, h=h)]:
+        search = GraphSearch(problem=problem, strategy=strategy)
+        start = time.perf_counter()
+        result, node = search.run()
+        elapsed = time.perf_counter() - start
+        print(f'{name}, {strategy}: {result}, cost {node.cost}, expanded nodes {search.expanded}, time {elapsed:.2f}s')
@@ -0,0 +1,35 @@
+import time
+from search.Problems import StreetProblem, MazeProblem
+from search.strategies import *
+from search.TreeSearch import TreeSearch
+from search.GraphSearch import GraphSearch
+from search.BidirectionalSearch import BidirectionalSearch
+from search.portfolio import Portfolio, describe
+from search.Environments import Roads, streets, streets_coords, random_maze
+
+map = Roads(streets, streets_coords)
+map_problem = StreetProblem(environment=map,
+                            initial_state='Andria',
+                            goal_state='Bari')
+maze = random_maze(60, 60, 0.25, seed=42)
+maze_problem = MazeProblem(environment=maze,
+                           initial_state=(0, 0),
+                           goal_state=(59, 59))
+
+for problem in [map_problem, maze_problem]:
+    # tree search with a depth first strategy may never end on these problems: the portfolio cancels it
+    searches = [TreeSearch(problem=problem, strategy=DepthFirst())]
+    searches += [GraphSearch(problem=problem, strategy=strategy)
+                 for strategy in [BreadthFirst(), UniformCost(), Greedy(problem), AStar(problem)]]
+    searches.append(BidirectionalSearch(problem=problem, heuristic=True))
+
+    for best in [False, True]:
+        portfolio = Portfolio(searches, deadline=10, best=best)
+        start = time.perf_counter()
+        result, node = portfolio.run()
+        elapsed = time.perf_counter() - start
+        print(f'{"Best" if best else "First"} solution in {elapsed:.2f}s: {result}, cost {node.cost}, '
+              f'winner {describe(portfolio.winner)}')
+        for name, result, cost, seconds in portfolio.reports:
+            print(f'\t{name}: {result}' + (f', cost {cost}, {seconds:.3f}s' if cost is not None else ''))
+    print("---------")
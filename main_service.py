@@ -0,0 +1,66 @@
+import asyncio
+import time
+from search.Problems import StreetProblem, MazeProblem
+from search.strategies import AStar, UniformCost
+from search.GraphSearch import GraphSearch
+from search.BidirectionalSearch import BidirectionalSearch
+from search.service import SearchService
+from search.Environments import random_roads, random_maze
+
+map = random_roads(5000, seed=0)
+maze = random_maze(150, 150, 0.25, seed=42)
+# the connectivity indexes are built at startup, so that the first requests do not stall the event loop
+map.connected('City 0', 'City 1')
+maze.build_components()
+
+
+def street_search(initial_state, goal_state, strategy=AStar):
+    problem = StreetProblem(environment=map, initial_state=initial_state, goal_state=goal_state)
+    return GraphSearch(problem=problem, strategy=strategy(problem) if strategy is AStar else strategy())
+
+
+async def request(service, name, search, deadline=None):
+    start = time.perf_counter()
+    try:
+        result, node = await service.solve(search, deadline=deadline)
+        outcome = f'{result}, cost {node.cost:.2f}' if result == 'Ok' else result
+    except asyncio.TimeoutError:
+        outcome = 'deadline expired'
+    except asyncio.CancelledError:
+        outcome = 'cancelled'
+    print(f'\t{name}: {outcome} after {time.perf_counter() - start:.3f}s')
+
+
+async def heartbeat(stop):
+    # the event loop stays responsive while the searches run
+    beats = 0
+    while not stop.is_set():
+        beats += 1
+        await asyncio.sleep(0.01)
+    print(f'\theartbeat: {beats} beats')
+
+
+async def main():
+    service = SearchService(time_slice=0.001)  # <- each search pauses every millisecond
+    stop = asyncio.Event()
+    beat = asyncio.ensure_future(heartbeat(stop))
+
+    maze_problem = MazeProblem(environment=maze, initial_state=(0, 0), goal_state=(149, 149))
+    requests = [request(service, f'route {i % 3} (copy {i // 3})', street_search('City 1', f'City {4000 + i % 3}'))
+                for i in range(9)]
+    requests.append(request(service, 'uniform cost route, 50ms deadline',
+                            street_search('City 7', 'City 4999', strategy=UniformCost), deadline=0.05))
+    requests.append(request(service, 'maze', GraphSearch(problem=maze_problem, strategy=AStar(maze_problem))))
+    requests.append(request(service, 'maze, bidirectional search in the executor',
+                            BidirectionalSearch(problem=maze_problem, heuristic=True), deadline=5))
+    cancelled = asyncio.ensure_future(request(service, 'cancelled maze request',
+                                              GraphSearch(problem=maze_problem, strategy=UniformCost())))
+    asyncio.get_running_loop().call_later(0.05, cancelled.cancel)
+
+    await asyncio.gather(*requests, cancelled, return_exceptions=True)
+    stop.set()
+    await beat
+    print(f'{service.requests} requests, {service.coalesced} coalesced')
+
+
+asyncio.run(main())
@@ -1,7 +1,12 @@
+import os
+import tempfile
 from search.Problems import StreetProblem
 from search.strategies import *
 from search.TreeSearch import TreeSearch
 from search.GraphSearch import GraphSearch
+from search.BidirectionalSearch import BidirectionalSearch
+from search.ShortestPathTreeSearch import ShortestPathTreeSearch
+from search.iterative_deepening import IterativeDeepening, IDAStar
 from search.Environments import streets, streets_coords, Roads
 import math
 
@@ -46,3 +51,57 @@ for strategy in strategies:
     except AttributeError:
         pass
 
+print("---------")
+
+# iterative deepening does not need to guess the depth limit
+for search in [IterativeDeepening(problem=map_problem), IDAStar(problem=map_problem)]:
+    result, node = search.run()
+    print(search)
+    print(result)
+    print(f'(limit, expanded nodes) per iteration: {search.iterations}')
+    try:
+        print(node.path())
+        print(node.cost)
+    except AttributeError:
+        pass
+
+print("---------")
+
+# bidirectional search (Uniform Cost / AStar)
+for search in [BidirectionalSearch(problem=map_problem), BidirectionalSearch(problem=map_problem, heuristic=True)]:
+    result, node = search.run()
+    print(search)
+    print(result)
+    try:
+        print(node.path())
+        print(node.cost)
+    except AttributeError:
+        pass
+
+print("---------")
+
+# landmark (ALT) heuristic: distances from/to a few landmarks are precomputed (and stored in the temporary directory)
+map.preprocess_landmarks(k=3, path=os.path.join(tempfile.gettempdir(), 'landmarks.npz'))
+for strategy in [AStar(map_problem), Greedy(map_problem)]:
+    search = GraphSearch(problem=map_problem, strategy=strategy)
+    result, node = search.run()
+    print(f'{strategy} with landmarks {map.landmarks}, {search}')
+    print(result)
+    print(f'expanded nodes: {search.expanded}')
+    try:
+        print(node.path())
+        print(node.cost)
+    except AttributeError:
+        pass
+
+print("---------")
+
+# many queries towards the same goal: the shortest path tree of the goal is computed once and cached on the map
+for city in ['Andria', 'Trani', 'Altamura']:
+    search = ShortestPathTreeSearch(problem=StreetProblem(environment=map, initial_state=city, goal_state=goal_state))
+    result, node = search.run()
+    print(f'{search}, from {city}')
+    print(result)
+    print(node.path())
+    print(node.cost)
+print(map.tree_cache_info())
@@ -0,0 +1,136 @@
+import heapq
+import math
+import time
+from search.Node import rebuild, state_key, surely_unreachable
+
+
+class ARAStar:
+    """
+    Anytime Repairing AStar: a sequence of weighted AStar searches (f = g + w * h) with decreasing weights.
+    A high weight finds a first solution quickly; each following search reuses the costs found so far and only
+    re-expands the states whose cost improved, so the solution improves while the weight decreases. Each solution
+    comes with a bound: its cost is at most bound times the optimal one (with an admissible heuristic).
+    """
+
+    def __init__(self, problem, weights=(5, 3, 2, 1.5, 1.25, 1), deadline=None, callback=None, h=None):
+        self.problem = problem
+        self.weights = weights
+        self.deadline = deadline  # <- seconds after which the best solution found so far is returned
+        self.callback = callback  # <- function called with each solution and its bound
+        self.h = h  # <- heuristic replacing the one of the problem
+        self.expanded = 0
+        self.bound = math.inf  # <- suboptimality bound of the last solution
+        self.history = []  # <- (cost, bound, seconds) of each solution
+
+    def __repr__(self):
+        return 'ARA* Search'
+
+    def solutions(self):
+        """
+        Runs the searches, yielding a solution each time its cost or its bound improves
+        :return: a generator of (node, bound)
+        """
+        start = time.perf_counter()
+        key = state_key(self.problem)
+        h = self.problem.h if self.h is None else self.h
+        self.expanded = 0
+        self.bound = math.inf
+        self.history = []
+
+        if surely_unreachable(self.problem):
+            return
+
+        k = key(self.problem.initial_state)
+        states = {k: self.problem.initial_state}
+        g = {k: 0}
+        parents = {k: None}  # <- key -> (key of the parent, action)
+        goal = k if self.problem.goal_test(self.problem.initial_state) else None
+        opened = {k}  # <- states to be expanded
+        inconsistent = set()  # <- states whose cost improved after being expanded with the current weight
+        counter = 0
+        expired = False
+        for w in self.weights:
+            # the states improved in the last search are expanded again, with the new weight
+            opened |= inconsistent
+            inconsistent = set()
+            closed = set()
+            fringe = []
+            for k in opened:
+                counter += 1
+                fringe.append((g[k] + w * h(states[k]), counter, g[k], k))
+            heapq.heapify(fringe)
+
+            while fringe:
+                f, _, cost, k = fringe[0]
+                if k not in opened or cost != g[k]:
+                    heapq.heappop(fringe)
+                    continue
+                if goal is not None and g[goal] <= f:
+                    break
+                if self.deadline is not None and time.perf_counter() - start > self.deadline:
+                    expired = True
+                    break
+                heapq.heappop(fringe)
+                opened.discard(k)
+                closed.add(k)
+                self.expanded += 1
+                state = states[k]
+                for s, a in self.problem.successors(state):
+                    ks = key(s)
+                    cost = g[k] + self.problem.cost(state, a)
+                    if cost >= g.get(ks, math.inf):
+                        continue
+                    g[ks] = cost
+                    parents[ks] = (k, a)
+                    states[ks] = s
+                    if self.problem.goal_test(s) and (goal is None or cost < g[goal]):
+                        goal = ks
+                    if ks in closed:
+                        inconsistent.add(ks)
+                    else:
+                        opened.add(ks)
+                        counter += 1
+                        heapq.heappush(fringe, (cost + w * h(s), counter, cost, ks))
+
+            if goal is not None:
+                # no unexpanded state can lead to a solution cheaper than this lower bound
+                lower = min((g[k] + h(states[k]) for k in opened | inconsistent), default=math.inf)
+                # the weight bounds the solution only if the search was completed, otherwise the bound of the
+                # previous solution (which is not cheaper) still holds
+                ratio = g[goal] / lower if lower > 0 else (1 if g[goal] == 0 else math.inf)
+                bound = max(1, min(self.bound if expired else w, ratio))
+                node = self.rebuild(goal, states, parents)
+                if not self.history or node.cost < self.history[-1][0] or bound < self.bound:
+                    self.bound = bound
+                    self.history.append((node.cost, bound, time.perf_counter() - start))
+                    yield node, bound
+                if bound == 1:
+                    return
+            if expired:
+                return
+
+    def rebuild(self, goal, states, parents):
+        """
+        Builds the nodes of the path to a state following the parents
+        :return: the last node
+        """
+        actions = []
+        k = goal
+        while parents[k] is not None:
+            k, action = parents[k]
+            actions.append(action)
+        return rebuild(self.problem, actions[::-1])
+
+    def run(self):
+        """
+        Run the search until the optimal solution is found or the deadline expires
+        :return: the best path found or a failure
+        """
+        best = None
+        for node, bound in self.solutions():
+            best = node
+            if self.callback is not None:
+                self.callback(node, bound)
+        if best is None:
+            return 'Fail', []
+        return 'Ok', best
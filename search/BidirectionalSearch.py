@@ -0,0 +1,123 @@
+import copy
+import math
+from search.Node import Node, root_node, state_key, surely_unreachable
+from search.fringe import PriorityFringe
+
+
+class BidirectionalSearch:
+    """
+    A class able to find a solution searching at the same time forward from the initial state and backward
+    from the goal state, for problems able to enumerate the predecessors of a state.
+    Without heuristic it is a bidirectional uniform cost search; with heuristic it is a bidirectional AStar
+    search using the average of the forward and the backward heuristics, which keeps them consistent.
+    """
+
+    def __init__(self, problem, heuristic=False):
+        self.problem = problem
+        self.heuristic = heuristic
+        self.expanded = 0
+
+    def __repr__(self):
+        if self.heuristic:
+            return 'Bidirectional AStar Search'
+        return 'Bidirectional Uniform Cost Search'
+
+    def potential(self):
+        """
+        Returns the potential of a state for the forward search (the backward one uses the opposite).
+        The backward heuristic is the heuristic of the problem having the initial state as goal.
+        :return: a function from a state to its potential
+        """
+        if not self.heuristic:
+            return lambda state: 0
+        reverse = copy.copy(self.problem)
+        reverse.goal_state = self.problem.initial_state
+        return lambda state: (self.problem.h(state) - reverse.h(state)) / 2
+
+    def run(self):
+        """
+        Run the search
+        :return: a path or a failure
+        """
+        key = state_key(self.problem)
+        potential = self.potential()
+        self.expanded = 0
+
+        if surely_unreachable(self.problem):
+            return 'Fail', []
+
+        start = root_node(self.problem)
+        if self.problem.goal_test(start.state):
+            return 'Ok', start
+        goal = Node(state=self.problem.goal_state,
+                    parent=None,
+                    action=None,
+                    cost=0,
+                    depth=0)
+
+        # index 0 for the forward search, 1 for the backward search
+        fringes = [PriorityFringe(key=lambda x: x.cost + potential(x.state)),
+                   PriorityFringe(key=lambda x: x.cost - potential(x.state))]
+        nodes = [{key(start.state): start}, {key(goal.state): goal}]
+        closed = [set(), set()]
+        fringes[0].push(start)
+        fringes[1].push(goal)
+
+        best, meeting = math.inf, None  # <- cost of the best path found so far and its meeting state
+        while True:
+            # drop the nodes already expanded or reached with a lower cost
+            for d in (0, 1):
+                while len(fringes[d]) != 0:
+                    node = fringes[d].peek()[1]
+                    k = key(node.state)
+                    if k not in closed[d] and nodes[d][k] is node:
+                        break
+                    fringes[d].pop()
+            if len(fringes[0]) == 0 or len(fringes[1]) == 0:
+                break
+            # stop when no path through the fringes can be cheaper than the best one
+            if fringes[0].peek()[0] + fringes[1].peek()[0] >= best:
+                break
+
+            # expand the smaller fringe
+            d = 0 if len(fringes[0]) <= len(fringes[1]) else 1
+            node = fringes[d].pop()
+            closed[d].add(key(node.state))
+            self.expanded += 1
+
+            if d == 0:
+                new_nodes = [node.expand(state=s,
+                                         action=a,
+                                         cost=self.problem.cost(node.state, a))
+                             for s, a in self.problem.successors(node.state)]
+            else:
+                # a backward node stores the action leading from its state to the state of its parent
+                new_nodes = [node.expand(state=s,
+                                         action=a,
+                                         cost=self.problem.cost(s, a))
+                             for s, a in self.problem.predecessors(node.state)]
+
+            for n in new_nodes:
+                k = key(n.state)
+                if k in nodes[d] and nodes[d][k].cost <= n.cost:
+                    continue
+                nodes[d][k] = n
+                closed[d].discard(k)
+                fringes[d].push(n)
+                # the two searches meet
+                other = nodes[1 - d].get(k)
+                if other is not None and n.cost + other.cost < best:
+                    best, meeting = n.cost + other.cost, k
+
+        if meeting is None:
+            return 'Fail', []
+
+        # join the forward path with the backward one
+        node = nodes[0][meeting]
+        back = nodes[1][meeting]
+        while back.parent is not None:
+            node = node.expand(state=back.parent.state,
+                               action=back.action,
+                               cost=self.problem.cost(back.state, back.action))
+            back = back.parent
+        return 'Ok', node
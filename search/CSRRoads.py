@@ -0,0 +1,234 @@
+import hashlib
+import os
+from collections.abc import Mapping
+import numpy as np
+from search.Environments import Roads, metrics
+
+
+class Neighbours(Mapping):
+    """
+    A read-only view of the streets of a CSRRoads: city id -> list of the ids of the reachable cities
+    """
+
+    def __init__(self, indptr, indices):
+        self.indptr = indptr
+        self.indices = indices
+
+    def __getitem__(self, city):
+        if not 0 <= city < len(self):
+            raise KeyError(city)
+        return self.indices[self.indptr[city]:self.indptr[city + 1]].tolist()
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def __iter__(self):
+        return iter(range(len(self)))
+
+
+class Coordinates(Mapping):
+    """
+    A read-only view of the coordinates of a CSRRoads: city id -> (latitude, longitude)
+    """
+
+    def __init__(self, points):
+        self.points = points
+
+    def __getitem__(self, city):
+        if not 0 <= city < len(self):
+            raise KeyError(city)
+        lat, long = self.points[city]
+        return float(lat), float(long)
+
+    def __len__(self):
+        return len(self.points)
+
+    def __iter__(self):
+        return iter(range(len(self)))
+
+
+class CSRRoads(Roads):
+    """
+    A road map stored as a compressed sparse row graph: the streets leaving city i are indices[indptr[i]:indptr[i+1]]
+    with lengths weights[indptr[i]:indptr[i+1]]. Cities are integer ids. It can be used wherever a Roads map is
+    expected (e.g., by StreetProblem), without building a Python list for each city.
+    """
+
+    def __init__(self, indptr, indices, weights, points, metric='flat', heuristic_cache_size=16,
+                 tree_cache_size=8, tree_cache_cities=10 ** 6):
+        self.indptr = indptr
+        self.indices = indices
+        self.points = points
+        super().__init__(Neighbours(indptr, indices), Coordinates(points),
+                         metric=metric, heuristic_cache_size=heuristic_cache_size,
+                         tree_cache_size=tree_cache_size, tree_cache_cities=tree_cache_cities)
+        self.weights = weights
+
+    def precompute_weights(self):
+        # the lengths of the streets are already stored in the weights array
+        pass
+
+    def reversed_streets(self):
+        """
+        Returns the reversed streets as a second compressed sparse row graph, built the first time they are needed:
+        the cities with a street towards city i are incoming_indices[incoming_indptr[i]:incoming_indptr[i+1]]
+        :return: a read-only mapping city id -> list of ids
+        """
+        if self.incoming is None:
+            sources = np.repeat(np.arange(len(self.indptr) - 1), np.diff(self.indptr))
+            order = np.argsort(self.indices, kind='stable')  # <- the sources of each city stay sorted
+            self.incoming_indptr = np.zeros(len(self.indptr), dtype=np.int64)
+            np.cumsum(np.bincount(self.indices, minlength=len(self.indptr) - 1), out=self.incoming_indptr[1:])
+            self.incoming_indices = sources[order]
+            self.incoming = Neighbours(self.incoming_indptr, self.incoming_indices)
+        return self.incoming
+
+    def connected(self, start, end):
+        # the components are labelled with array operations over all the streets at once
+        if self.components is None:
+            self.build_components()
+        if not (0 <= start < len(self.components) and 0 <= end < len(self.components)):
+            return start == end
+        return bool(self.components[start] == self.components[end])
+
+    def build_components(self):
+        """
+        Labels each city with the smallest id of its connected component (ignoring the direction of the streets).
+        Every round hooks the label of the larger end of each street to the smaller one, then follows the labels
+        until each one is the label of itself, so the number of rounds grows only with the logarithm of the
+        diameter of the map.
+        """
+        sources = np.repeat(np.arange(len(self.indptr) - 1), np.diff(self.indptr))
+        targets = np.asarray(self.indices)
+        labels = np.arange(len(self.indptr) - 1)
+        while True:
+            low, high = labels[sources], labels[targets]
+            low, high = np.minimum(low, high), np.maximum(low, high)
+            crossing = low != high
+            if not crossing.any():
+                break
+            np.minimum.at(labels, high[crossing], low[crossing])
+            while True:
+                jumped = labels[labels]
+                if np.array_equal(jumped, labels):
+                    break
+                labels = jumped
+        self.components = labels
+
+    def distance(self, start, end):
+        """
+        Returns the length of the street between two cities (the straight line if there is no such street)
+        """
+        begin, stop = self.indptr[start], self.indptr[start + 1]
+        # the streets leaving a city are sorted by destination
+        i = begin + np.searchsorted(self.indices[begin:stop], end)
+        if i < stop and self.indices[i] == end:
+            return float(self.weights[i])
+        return float(self.metric(*self.points[start], *self.points[end]))
+
+    def fingerprint(self):
+        # the arrays describe the whole map
+        digest = hashlib.sha1()
+        for values in (self.indptr, self.indices, self.weights):
+            digest.update(np.ascontiguousarray(values).tobytes())
+        return digest.hexdigest()
+
+    def batch_distance(self, cities, end):
+        cities = np.asarray(cities, dtype=np.int64)
+        return self.metric(self.points[cities, 0], self.points[cities, 1], *self.points[end])
+
+    def goal_distances(self, goal):
+        # an array indexed by city id
+        return self.metric(self.points[:, 0], self.points[:, 1], *self.points[goal])
+
+    @classmethod
+    def from_edges(cls, sources, targets, points, weights=None, two_way=False, metric='flat'):
+        """
+        Builds the compressed sparse row graph from an edge list
+        :param sources: array with the source city of each street
+        :param targets: array with the destination city of each street
+        :param points: array with the (latitude, longitude) of each city
+        :param weights: array with the length of each street (computed from the coordinates if None)
+        :param two_way: if True each street can be travelled in both directions
+        :param metric: the distance between coordinates ('flat' or 'haversine')
+        :return: a CSRRoads map
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        points = np.asarray(points, dtype=np.float64)
+        if weights is None:
+            weights = metrics[metric](points[sources, 0], points[sources, 1], points[targets, 0], points[targets, 1])
+        weights = np.asarray(weights, dtype=np.float64)
+        if two_way:
+            sources, targets = np.concatenate([sources, targets]), np.concatenate([targets, sources])
+            weights = np.concatenate([weights, weights])
+
+        order = np.lexsort((targets, sources))
+        indptr = np.zeros(len(points) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=len(points)), out=indptr[1:])
+        return cls(indptr, targets[order], weights[order], points, metric=metric)
+
+    @classmethod
+    def load_csv(cls, edges_path, coordinates_path, two_way=False, delimiter=','):
+        """
+        Reads a map from two CSV files with a header line
+        :param edges_path: a file with the columns source, target and (optionally) length
+        :param coordinates_path: a file with the columns id, latitude, longitude
+        :param two_way: if True each street can be travelled in both directions
+        :param delimiter: the column separator
+        :return: a CSRRoads map
+        """
+        edges = np.loadtxt(edges_path, delimiter=delimiter, skiprows=1, ndmin=2)
+        nodes = np.loadtxt(coordinates_path, delimiter=delimiter, skiprows=1, ndmin=2)
+        points = np.zeros((int(nodes[:, 0].max()) + 1, 2))
+        points[nodes[:, 0].astype(np.int64)] = nodes[:, 1:3]
+        weights = edges[:, 2] if edges.shape[1] > 2 else None
+        return cls.from_edges(edges[:, 0], edges[:, 1], points, weights=weights, two_way=two_way)
+
+    def save(self, directory):
+        """
+        Writes the arrays of the map into a directory, in the binary NumPy format, and the name of its metric
+        :param directory: the output directory
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name in ['indptr', 'indices', 'weights', 'points']:
+            np.save(os.path.join(directory, f'{name}.npy'), getattr(self, name))
+        with open(os.path.join(directory, 'metric.txt'), 'w') as file:
+            file.write(self.metric_name)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """
+        Reads a map written by save. The arrays are memory-mapped, so only the parts actually used are read.
+        :param directory: the input directory
+        :param mmap: if False the arrays are loaded in memory
+        :return: a CSRRoads map
+        """
+        mode = 'r' if mmap else None
+        arrays = [np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mode)
+                  for name in ['indptr', 'indices', 'weights', 'points']]
+        metric = 'flat'  # <- maps saved without their metric
+        path = os.path.join(directory, 'metric.txt')
+        if os.path.exists(path):
+            with open(path) as file:
+                metric = file.read().strip()
+        return cls(*arrays, metric=metric)
+
+    @classmethod
+    def from_roads(cls, roads):
+        """
+        Converts a Roads map, numbering the cities in the order of roads.streets
+        :param roads: a Roads map
+        :return: the CSRRoads map and the list of the names of the cities (id -> name)
+        """
+        names = list(roads.streets)
+        ids = {name: i for i, name in enumerate(names)}
+        sources, targets, weights = [], [], []
+        for city, neighbours in roads.streets.items():
+            for n in neighbours:
+                sources.append(ids[city])
+                targets.append(ids[n])
+                weights.append(roads.distance(city, n))
+        points = [roads.coordinates[name] for name in names]
+        return cls.from_edges(sources, targets, points, weights=weights, metric=roads.metric_name), names
+
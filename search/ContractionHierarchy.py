@@ -0,0 +1,218 @@
+import heapq
+import math
+from search.Node import rebuild
+
+
+class ContractionHierarchy:
+    """
+    A preprocessing of a Roads map for answering many shortest path queries. The cities are contracted one at a
+    time from the least important one: contracting a city adds a shortcut between two of its neighbours whenever
+    the shortest path between them passes through the city. A query then only needs two small searches, one from
+    each end, which only move towards more important cities.
+    """
+
+    def __init__(self, roads, witness_limit=50):
+        self.roads = roads
+        self.witness_limit = witness_limit  # <- maximum number of cities settled by a witness search
+        self.rank = {}  # <- city -> position in the contraction order
+        self.edges = {}  # <- (city, city) -> (weight, middle city or None for a street)
+        self.upward = {}  # <- city -> [(more important city, weight)] following the streets
+        self.downward = {}  # <- city -> [(more important city, weight)] against the streets
+        self.shortcuts = 0
+
+    def __repr__(self):
+        return 'Contraction Hierarchy'
+
+    def witness(self, outgoing, source, target_limit, skip):
+        """
+        A Dijkstra search from a city avoiding a given city, stopped after a few settled cities
+        :param outgoing: the adjacency of the graph
+        :param source: the starting city
+        :param target_limit: the distance after which the search stops
+        :param skip: the city being contracted
+        :return: a dictionary city -> distance of the settled and reached cities
+        """
+        distances = {source: 0}
+        fringe = [(0, source)]
+        settled = 0
+        while fringe and settled < self.witness_limit:
+            d, city = heapq.heappop(fringe)
+            if d > distances[city]:
+                continue
+            if d > target_limit:
+                break
+            settled += 1
+            for n, w in outgoing[city].items():
+                if n == skip or n in self.rank:
+                    continue
+                if d + w < distances.get(n, math.inf):
+                    distances[n] = d + w
+                    heapq.heappush(fringe, (d + w, n))
+        return distances
+
+    def needed_shortcuts(self, outgoing, incoming, city):
+        """
+        Computes the shortcuts needed to contract a city
+        :return: a list of (from city, to city, weight)
+        """
+        shortcuts = []
+        targets = {w: weight for w, weight in outgoing[city].items() if w not in self.rank}
+        if not targets:
+            return shortcuts
+        for u, weight_in in incoming[city].items():
+            if u in self.rank:
+                continue
+            limit = weight_in + max(targets.values())
+            distances = self.witness(outgoing, u, limit, city)
+            for w, weight_out in targets.items():
+                if w != u and distances.get(w, math.inf) > weight_in + weight_out:
+                    shortcuts.append((u, w, weight_in + weight_out))
+        return shortcuts
+
+    def priority(self, outgoing, incoming, city, contracted_neighbours):
+        # edge difference: added shortcuts minus removed edges, plus the already contracted neighbours
+        removed = sum(1 for n in outgoing[city] if n not in self.rank) + \
+            sum(1 for n in incoming[city] if n not in self.rank)
+        return len(self.needed_shortcuts(outgoing, incoming, city)) - removed + contracted_neighbours[city]
+
+    def preprocess(self):
+        """
+        Contracts all the cities, building the upward and downward graphs used by the queries
+        """
+        outgoing = {city: {} for city in self.roads.streets}
+        incoming = {city: {} for city in self.roads.streets}
+        for city, neighbours in self.roads.streets.items():
+            for n in neighbours:
+                weight = self.roads.distance(city, n)
+                outgoing.setdefault(n, {})
+                incoming.setdefault(n, {})
+                if weight < outgoing[city].get(n, math.inf):
+                    outgoing[city][n] = weight
+                    incoming[n][city] = weight
+                    self.edges[(city, n)] = (weight, None)
+
+        self.rank = {}
+        self.shortcuts = 0
+        contracted_neighbours = {city: 0 for city in outgoing}
+        queue = [(self.priority(outgoing, incoming, city, contracted_neighbours), i, city)
+                 for i, city in enumerate(outgoing)]
+        heapq.heapify(queue)
+        while queue:
+            _, i, city = heapq.heappop(queue)
+            # lazy update: the priority may have grown since the city was queued
+            current = self.priority(outgoing, incoming, city, contracted_neighbours)
+            if queue and current > queue[0][0]:
+                heapq.heappush(queue, (current, i, city))
+                continue
+
+            for u, w, weight in self.needed_shortcuts(outgoing, incoming, city):
+                if weight < outgoing[u].get(w, math.inf):
+                    outgoing[u][w] = weight
+                    incoming[w][u] = weight
+                    self.edges[(u, w)] = (weight, city)
+                    self.shortcuts += 1
+            self.rank[city] = len(self.rank)
+            for n in list(outgoing[city]) + list(incoming[city]):
+                contracted_neighbours[n] += 1
+
+        self.upward = {city: [] for city in outgoing}
+        self.downward = {city: [] for city in outgoing}
+        for (u, w), (weight, _) in self.edges.items():
+            if self.rank[w] > self.rank[u]:
+                self.upward[u].append((w, weight))
+            else:
+                self.downward[w].append((u, weight))
+
+    def unpack(self, u, w):
+        """
+        Replaces the shortcuts between two cities with the streets they stand for
+        :return: the list of cities after u up to w
+        """
+        path = []
+        stack = [(u, w)]
+        while stack:
+            a, b = stack.pop()
+            middle = self.edges[(a, b)][1]
+            if middle is None:
+                path.append(b)
+            else:
+                stack.append((middle, b))
+                stack.append((a, middle))
+        return path
+
+    def query(self, start, end):
+        """
+        Bidirectional upward search between two cities
+        :param start: a city
+        :param end: a city
+        :return: the length of the shortest path and the list of cities after start up to end (None if unreachable)
+        """
+        if start == end:
+            return 0, []
+        distances = [{start: 0}, {end: 0}]
+        parents = [{start: None}, {end: None}]
+        fringes = [[(0, start)], [(0, end)]]
+        graphs = [self.upward, self.downward]
+        best, meeting = math.inf, None
+        while fringes[0] or fringes[1]:
+            for d in (0, 1):
+                if not fringes[d]:
+                    continue
+                dist, city = heapq.heappop(fringes[d])
+                if dist > distances[d][city]:
+                    continue
+                # the searches of a hierarchy may stop only when both fringes exceed the best path
+                if dist >= best:
+                    fringes[d] = []
+                    continue
+                for n, weight in graphs[d][city]:
+                    if dist + weight < distances[d].get(n, math.inf):
+                        distances[d][n] = dist + weight
+                        parents[d][n] = city
+                        heapq.heappush(fringes[d], (dist + weight, n))
+                        if n in distances[1 - d] and dist + weight + distances[1 - d][n] < best:
+                            best, meeting = dist + weight + distances[1 - d][n], n
+                if city in distances[1 - d] and dist + distances[1 - d][city] < best:
+                    best, meeting = dist + distances[1 - d][city], city
+        if meeting is None:
+            return math.inf, None
+
+        # hierarchy path: start -> meeting following the upward edges, meeting -> end following the downward ones
+        up = []
+        city = meeting
+        while city is not None:
+            up.append(city)
+            city = parents[0][city]
+        up = list(reversed(up))
+        city = meeting
+        while parents[1][city] is not None:
+            up.append(parents[1][city])
+            city = parents[1][city]
+
+        path = []
+        for a, b in zip(up, up[1:]):
+            path.extend(self.unpack(a, b))
+        return best, path
+
+
+class ContractionHierarchySearch:
+    """
+    A class answering a StreetProblem with a preprocessed contraction hierarchy of its map
+    """
+
+    def __init__(self, problem, hierarchy):
+        self.problem = problem
+        self.hierarchy = hierarchy
+
+    def __repr__(self):
+        return 'Contraction Hierarchy Search'
+
+    def run(self):
+        """
+        Run the search
+        :return: a path or a failure
+        """
+        _, cities = self.hierarchy.query(self.problem.initial_state, self.problem.goal_state)
+        if cities is None:
+            return 'Fail', []
+        return 'Ok', rebuild(self.problem, cities)
@@ -0,0 +1,144 @@
+import heapq
+import math
+from search.Node import rebuild
+
+
+class DStarLite:
+    """
+    D* Lite incremental replanning for the MazeProblem. The search runs backward from the goal and keeps, for each
+    cell, its distance from the goal (g) and a one-step lookahead of it (rhs). When walls are added or removed only
+    the cells whose distance changes are visited again, and the agent may move between two plans.
+    """
+
+    def __init__(self, problem):
+        self.problem = problem
+        self.maze = problem.environment
+        self.start = problem.initial_state
+        self.last = self.start  # <- position of the agent when the distances were last repaired
+        self.goal = problem.goal_state
+        self.km = 0  # <- accumulated heuristic offset of the agent moves
+        self.g = {}
+        self.rhs = {self.goal: 0}
+        self.queue = []
+        self.queued = {}  # <- cell -> its key in the queue (entries with a different key are stale)
+        self.counter = 0
+        self.expanded = 0
+        self.push(self.goal)
+
+    def __repr__(self):
+        return 'D* Lite Search'
+
+    def h(self, a, b):
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    def cost(self, a, b):
+        # moving between two cells costs 1, unless one of them is a wall
+        return 1 if self.maze.is_free(a) and self.maze.is_free(b) else math.inf
+
+    def neighbours(self, cell):
+        for dr, dc in self.maze.moves.values():
+            r, c = cell[0] + dr, cell[1] + dc
+            if 0 <= r < self.maze.height and 0 <= c < self.maze.width:
+                yield r, c
+
+    def key(self, cell):
+        value = min(self.g.get(cell, math.inf), self.rhs.get(cell, math.inf))
+        return value + self.h(self.start, cell) + self.km, value
+
+    def push(self, cell):
+        key = self.key(cell)
+        self.queued[cell] = key
+        heapq.heappush(self.queue, (key, self.counter, cell))
+        self.counter += 1
+
+    def top(self):
+        # drop the stale entries
+        while self.queue and self.queued.get(self.queue[0][2]) != self.queue[0][0]:
+            heapq.heappop(self.queue)
+        return self.queue[0] if self.queue else ((math.inf, math.inf), 0, None)
+
+    def update(self, cell):
+        """
+        Recomputes the lookahead of a cell and puts it in the queue if it is inconsistent
+        """
+        if cell != self.goal:
+            self.rhs[cell] = min((self.cost(cell, n) + self.g.get(n, math.inf) for n in self.neighbours(cell)),
+                                 default=math.inf)
+        self.queued.pop(cell, None)
+        if self.g.get(cell, math.inf) != self.rhs.get(cell, math.inf):
+            self.push(cell)
+
+    def compute(self):
+        """
+        Repairs the distances until the one of the agent position is correct
+        """
+        while True:
+            key, _, cell = self.top()
+            start_rhs = self.rhs.get(self.start, math.inf)
+            if cell is None or (key >= self.key(self.start) and start_rhs == self.g.get(self.start, math.inf)):
+                return
+            self.expanded += 1
+            new_key = self.key(cell)
+            if key < new_key:
+                self.push(cell)
+            elif self.g.get(cell, math.inf) > self.rhs.get(cell, math.inf):
+                # the cell got closer to the goal
+                del self.queued[cell]
+                self.g[cell] = self.rhs[cell]
+                for n in self.neighbours(cell):
+                    self.update(n)
+            else:
+                # the cell got farther from the goal
+                self.g[cell] = math.inf
+                self.update(cell)
+                for n in self.neighbours(cell):
+                    self.update(n)
+
+    def move(self, state):
+        """
+        Moves the agent to a new cell: the next plan starts from there
+        :param state: the new position of the agent
+        """
+        self.start = state
+        self.problem.initial_state = state
+        self.km += self.h(self.last, self.start)
+        self.last = self.start
+
+    def update_walls(self, added=(), removed=()):
+        """
+        Changes the walls of the maze, marking the cells whose distance may change
+        :param added: cells where a wall is put
+        :param removed: cells whose wall is removed
+        """
+        changed = []
+        for cell in added:
+            if self.maze.is_free(cell):
+                self.maze.add_wall(cell)
+                changed.append(tuple(cell))
+        for cell in removed:
+            if not self.maze.is_free(cell):
+                self.maze.remove_wall(cell)
+                changed.append(tuple(cell))
+        for cell in changed:
+            self.update(cell)
+            for n in self.neighbours(cell):
+                self.update(n)
+
+    def run(self):
+        """
+        Run the search (or repair the previous one)
+        :return: a path or a failure
+        """
+        self.compute()
+        if self.g.get(self.start, math.inf) == math.inf:
+            return 'Fail', []
+
+        # follow the neighbours closest to the goal
+        moves = {step: action for action, step in self.maze.moves.items()}
+        actions = []
+        cell = self.start
+        while cell != self.goal:
+            n = min(self.neighbours(cell), key=lambda n: self.cost(cell, n) + self.g.get(n, math.inf))
+            actions.append(moves[(n[0] - cell[0], n[1] - cell[1])])
+            cell = n
+        return 'Ok', rebuild(self.problem, actions)
@@ -1,5 +1,11 @@
+import hashlib
+import heapq
 import math
+import os
+import random
+from collections import OrderedDict, deque
 import numpy as np
+from search.UnionFind import UnionFind
 
 streets = {
     'Andria': ['Corato', 'Trani'],
@@ -33,29 +39,528 @@ streets_coords = {
 }
 
 
+def flat_distance(lat_a, long_a, lat_b, long_b):
+    """
+    Distance in KM between points, treating latitude and longitude as planar coordinates.
+    It works on numbers as well as on NumPy arrays (element-wise).
+    """
+    lat_diff = (lat_a - lat_b) * 111  # <- *111 to just convert the latitude distance in KM.
+    long_diff = (long_a - long_b) * 111  # <- *111 to just convert the longitude distance in KM.
+    return np.sqrt(lat_diff ** 2 + long_diff ** 2)
+
+
+def haversine_distance(lat_a, long_a, lat_b, long_b):
+    """
+    Great-circle distance in KM between points on the Earth.
+    It works on numbers as well as on NumPy arrays (element-wise).
+    """
+    lat_a, long_a, lat_b, long_b = np.radians(lat_a), np.radians(long_a), np.radians(lat_b), np.radians(long_b)
+    a = np.sin((lat_b - lat_a) / 2) ** 2 + np.cos(lat_a) * np.cos(lat_b) * np.sin((long_b - long_a) / 2) ** 2
+    return 2 * 6371.0 * np.arcsin(np.sqrt(a))  # <- 6371 KM: mean radius of the Earth
+
+
+metrics = {'flat': flat_distance, 'haversine': haversine_distance}
+
+
 class Roads:
-    def __init__(self, streets, coordinates):
+    def __init__(self, streets, coordinates, metric='flat', heuristic_cache_size=16,
+                 tree_cache_size=8, tree_cache_cities=10 ** 6):
         self.streets = streets
         self.coordinates = coordinates
+        self.metric_name = metric  # <- name of the metric, e.g. to rebuild the map in another process
+        self.metric = metrics[metric]
+        self.weights = {}  # <- (city, city) -> length of the street
+        self.heuristics = OrderedDict()  # <- goal -> distance of every city from the goal (least recently used first)
+        self.heuristic_cache_size = heuristic_cache_size
+        self.trees = OrderedDict()  # <- goal -> shortest path tree towards the goal (least recently used first)
+        self.tree_cache_size = tree_cache_size  # <- maximum number of cached trees
+        self.tree_cache_cities = tree_cache_cities  # <- maximum number of cities in all the cached trees
+        self.tree_cities = 0
+        self.tree_hits = 0
+        self.tree_misses = 0
+        self.incoming = None  # <- reversed streets, built when needed
+        self.landmarks = []  # <- landmarks of the ALT heuristic
+        self.landmark_index = {}  # <- city -> column of the landmark tables
+        self.from_landmarks = None  # <- distances from each landmark to each city
+        self.to_landmarks = None  # <- distances from each city to each landmark
+        self.components = None  # <- connected components of the streets, built when needed
+        self.component_index = {}  # <- city -> element of the components
+        self.precompute_weights()
+
+    def precompute_weights(self):
+        """
+        Computes the length of all the streets at once
+        """
+        edges = [(city, n) for city, neighbours in self.streets.items() for n in neighbours]
+        if not edges:
+            return
+        start = np.array([self.coordinates[a] for a, _ in edges])
+        end = np.array([self.coordinates[b] for _, b in edges])
+        lengths = self.metric(start[:, 0], start[:, 1], end[:, 0], end[:, 1])
+        self.weights = dict(zip(edges, lengths.tolist()))
 
     def distance(self, start, end):
-        lat_a, long_a = self.coordinates[start]
+        weight = self.weights.get((start, end))
+        if weight is None:
+            lat_a, long_a = self.coordinates[start]
+            lat_b, long_b = self.coordinates[end]
+            weight = float(self.metric(lat_a, long_a, lat_b, long_b))
+        return weight
+
+    def batch_distance(self, cities, end):
+        """
+        Computes the straight distances of many cities from a city at once
+        :param cities: a list of cities
+        :param end: a city
+        :return: an array of distances
+        """
+        points = np.array([self.coordinates[c] for c in cities]).reshape(-1, 2)
         lat_b, long_b = self.coordinates[end]
-        lat_diff = abs(lat_a - lat_b)*111  # <- *111 to just convert the latitude distance in KM.
-        long_diff = abs(long_a - long_b)*111 # <- *111 to just convert the longitude distance in KM.
-        return math.sqrt(lat_diff**2 + long_diff**2)
+        return self.metric(points[:, 0], points[:, 1], lat_b, long_b)
+
+    def goal_distances(self, goal):
+        """
+        Computes in a single batch the straight distance of every city from a goal
+        :param goal: a city
+        :return: a dictionary city -> distance
+        """
+        cities = list(self.coordinates)
+        return dict(zip(cities, self.batch_distance(cities, goal).tolist()))
+
+    def heuristic(self, goal):
+        """
+        Returns the straight distance of every city from a goal. The table of each goal is kept
+        in a bounded cache, so repeated queries never compute it again.
+        :param goal: a city
+        :return: a table city -> distance
+        """
+        table = self.heuristics.get(goal)
+        if table is None:
+            table = self.heuristics[goal] = self.goal_distances(goal)
+            if len(self.heuristics) > self.heuristic_cache_size:
+                self.heuristics.popitem(last=False)
+        else:
+            self.heuristics.move_to_end(goal)
+        return table
+
+    def reversed_streets(self):
+        """
+        Returns the reversed streets, built the first time they are needed
+        :return: a dictionary city -> list of the cities with a street towards it
+        """
+        if self.incoming is None:
+            self.incoming = {city: [] for city in self.streets}
+            for city, neighbours in self.streets.items():
+                for n in neighbours:
+                    self.incoming.setdefault(n, []).append(city)
+        return self.incoming
+
+    def shortest_path_tree(self, source, reverse=False):
+        """
+        Computes the shortest paths from a city to every city (Dijkstra)
+        :param source: a city
+        :param reverse: if True, the shortest paths from every city to the source
+        :return: a dictionary city -> distance (unreachable cities are missing) and a dictionary city -> previous
+        city on its shortest path (with reverse, the next city towards the source)
+        """
+        adjacency = self.reversed_streets() if reverse else self.streets
+
+        distances = {source: 0}
+        parents = {source: None}
+        fringe = [(0, source)]
+        while fringe:
+            d, city = heapq.heappop(fringe)
+            if d > distances[city]:
+                continue
+            for n in adjacency.get(city, []):
+                nd = d + (self.distance(n, city) if reverse else self.distance(city, n))
+                if nd < distances.get(n, math.inf):
+                    distances[n] = nd
+                    parents[n] = city
+                    heapq.heappush(fringe, (nd, n))
+        return distances, parents
+
+    def shortest_distances(self, source, reverse=False):
+        """
+        Computes the length of the shortest paths from a city to every city (Dijkstra)
+        :param source: a city
+        :param reverse: if True, the lengths of the shortest paths from every city to the source
+        :return: a dictionary city -> distance (unreachable cities are missing)
+        """
+        return self.shortest_path_tree(source, reverse=reverse)[0]
+
+    def goal_tree(self, goal, build=True):
+        """
+        Returns the tree of the shortest paths from every city to a goal. The trees are kept in a cache
+        which evicts the least recently used ones when it holds too many trees or too many cities.
+        :param goal: a city
+        :param build: if False, a tree not in the cache is not computed
+        :return: a dictionary city -> next city towards the goal, or None
+        """
+        tree = self.trees.get(goal)
+        if tree is not None:
+            self.tree_hits += 1
+            self.trees.move_to_end(goal)
+            return tree
+        self.tree_misses += 1
+        if not build:
+            return None
+
+        tree = self.shortest_path_tree(goal, reverse=True)[1]
+        self.trees[goal] = tree
+        self.tree_cities += len(tree)
+        while len(self.trees) > 1 and (len(self.trees) > self.tree_cache_size or self.tree_cities > self.tree_cache_cities):
+            _, evicted = self.trees.popitem(last=False)
+            self.tree_cities -= len(evicted)
+        return tree
+
+    def connected(self, start, end):
+        """
+        Checks if two cities belong to the same connected component of the map (ignoring the direction of
+        the streets). If they do not, no path joins them.
+        :param start: a city
+        :param end: a city
+        :return: False if the cities are surely disconnected, True otherwise
+        """
+        if self.components is None:
+            self.component_index = {city: i for i, city in enumerate(self.streets)}
+            self.components = UnionFind(len(self.component_index))
+            for city, neighbours in self.streets.items():
+                for n in neighbours:
+                    if n not in self.component_index:
+                        self.component_index[n] = self.components.add()
+                    self.components.union(self.component_index[city], self.component_index[n])
+        if start not in self.component_index or end not in self.component_index:
+            return start == end
+        return self.components.connected(self.component_index[start], self.component_index[end])
+
+    def tree_cache_info(self):
+        """
+        Statistics of the cache of the shortest path trees
+        :return: a dictionary
+        """
+        return {'hits': self.tree_hits,
+                'misses': self.tree_misses,
+                'trees': len(self.trees),
+                'cities': self.tree_cities}
+
+    def fingerprint(self):
+        """
+        A digest of the streets and of their lengths, identifying the map (e.g., to check that the tables saved
+        for a map are not loaded for another one)
+        :return: a hexadecimal string
+        """
+        digest = hashlib.sha1()
+        for city, neighbours in self.streets.items():
+            digest.update(repr((city, [(n, self.distance(city, n)) for n in neighbours])).encode())
+        return digest.hexdigest()
+
+    def preprocess_landmarks(self, k, path=None):
+        """
+        Selects k landmarks and computes the exact distances from and to them, used by the ALT heuristic.
+        The landmarks are chosen one at a time as the city farthest from the ones already chosen.
+        :param k: number of landmarks
+        :param path: a .npz file; if it holds the tables of the same map they are loaded from it, otherwise they
+        are computed and saved into it
+        """
+        cities = list(self.streets)
+        fingerprint = self.fingerprint() if path is not None else None
+        if path is not None and os.path.exists(path):
+            tables = np.load(path)
+            if 'fingerprint' in tables.files and tables['fingerprint'].item() == fingerprint \
+                    and len(tables['landmarks']) == k:
+                self.landmarks = tables['landmarks'].tolist()
+                self.landmark_index = {city: i for i, city in enumerate(cities)}
+                self.from_landmarks = tables['from_landmarks']
+                self.to_landmarks = tables['to_landmarks']
+                return
+
+        landmarks = []
+        from_landmarks, to_landmarks = [], []
+        closest = {city: math.inf for city in cities}  # <- distance of each city from the chosen landmarks
+        for _ in range(min(k, len(cities))):
+            # the first landmark is the first city, the next ones the farthest from the chosen ones
+            landmark = cities[0] if not landmarks else max(cities, key=closest.get)
+            landmarks.append(landmark)
+            forward = self.shortest_distances(landmark)
+            backward = self.shortest_distances(landmark, reverse=True)
+            from_landmarks.append([forward.get(c, math.inf) for c in cities])
+            to_landmarks.append([backward.get(c, math.inf) for c in cities])
+            for c in cities:
+                closest[c] = min(closest[c], forward.get(c, math.inf))
+
+        self.landmarks = landmarks
+        self.landmark_index = {city: i for i, city in enumerate(cities)}
+        self.from_landmarks = np.array(from_landmarks)
+        self.to_landmarks = np.array(to_landmarks)
+        if path is not None:
+            np.savez(path, cities=np.array(cities), landmarks=np.array(landmarks), fingerprint=np.array(fingerprint),
+                     from_landmarks=self.from_landmarks, to_landmarks=self.to_landmarks)
+
+    def landmark_bound(self, start, end):
+        """
+        Lower bound of the length of the shortest path between two cities given by the triangle inequality
+        on the landmark distances (ALT heuristic)
+        :param start: a city
+        :param end: a city
+        :return: the lower bound
+        """
+        s, e = self.landmark_index[start], self.landmark_index[end]
+        with np.errstate(invalid='ignore'):
+            # d(L, end) - d(L, start) <= d(start, end) and d(start, L) - d(end, L) <= d(start, end)
+            bounds = np.concatenate([self.from_landmarks[:, e] - self.from_landmarks[:, s],
+                                     self.to_landmarks[:, s] - self.to_landmarks[:, e]])
+        bounds = bounds[~np.isnan(bounds)]  # <- landmarks reaching (or reached from) neither city
+        return max(0.0, bounds.max()) if bounds.size != 0 else 0.0
+
+
+def random_roads(n, neighbours=3, seed=None, south_west=(40.8, 16.2), north_east=(41.3, 16.9)):
+    """
+    Generates a road map with randomly placed cities, each one connected by two-way streets to its nearest cities
+    :param n: number of cities
+    :param neighbours: number of nearest cities each city is connected to
+    :param seed: seed of the random generator, for reproducible maps
+    :param south_west: (latitude, longitude) of the south-west corner of the area
+    :param north_east: (latitude, longitude) of the north-east corner of the area
+    :return: a Roads map
+    """
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(south_west, north_east, size=(n, 2))
+    cities = [f'City {i}' for i in range(n)]
+    coordinates = {city: (float(lat), float(long)) for city, (lat, long) in zip(cities, points)}
+
+    roads = {city: [] for city in cities}
+    for i, city in enumerate(cities):
+        distances = flat_distance(points[:, 0], points[:, 1], *points[i])
+        for j in np.argsort(distances)[1:neighbours + 1]:
+            if cities[j] not in roads[city]:
+                roads[city].append(cities[j])
+                roads[cities[j]].append(city)
+    return Roads(roads, coordinates)
 
 
 class Maze:
+    moves = {'up': (-1, 0), 'down': (1, 0), 'left': (0, -1), 'right': (0, 1)}
+    split_cells = 4096  # <- cells visited looking for a split of the components when a wall is added
+
     def __init__(self, M, N, K, V):
         self.width = N
         self.height = M
         self.n_walls = K
         self.p_walls = V
+        self.occupancy = self.create_environment()  # <- occupancy grid used to check the walls in O(1)
+        self.walls_stamp = self.stamp()  # <- walls the occupancy grid was built from
+        self.cell_actions = {}  # <- cache of the possible actions of each cell
+        self.components = None  # <- connected components of the free cells, built when needed
+        self.labels = None  # <- element of the components of each free cell (-1 for walls)
+        self.listeners = []  # <- functions called with the cell whose wall is added or removed
 
     def create_environment(self):
         maze = np.ones((self.height, self.width), dtype=int)  # <- 1: reachable element
-        for i in range(self.n_walls):
-            maze[self.p_walls[i][0]][self.p_walls[i][1]] = 2  # <- 2: unreachable element
+        if self.n_walls > 0:
+            rows, cols = zip(*self.p_walls[:self.n_walls])
+            maze[list(rows), list(cols)] = 2  # <- 2: unreachable element
 
         return maze
+
+    def stamp(self):
+        return id(self.p_walls), len(self.p_walls), self.n_walls
+
+    def sync(self):
+        """
+        Rebuilds the occupancy grid when the walls were changed directly (e.g., appending to p_walls or changing
+        n_walls) instead of with add_wall and remove_wall, and notifies the listeners of the changed cells.
+        The changes are detected in O(1) from the list and the number of walls, so replacing a wall in place is
+        not detected.
+        """
+        if self.walls_stamp == self.stamp():
+            return
+        previous = self.occupancy
+        self.occupancy = self.create_environment()
+        self.walls_stamp = self.stamp()
+        self.cell_actions = {}
+        self.components = None
+        self.labels = None
+        for r, c in np.argwhere(previous != self.occupancy).tolist():
+            self.notify((r, c))
+
+    @property
+    def grid(self):
+        """
+        The occupancy grid of the maze, in sync with the walls
+        """
+        self.sync()
+        return self.occupancy
+
+    def is_free(self, cell):
+        """
+        Checks if a cell is inside the maze and it is not a wall
+        :param cell: a (row, column) tuple
+        :return: True if the cell is reachable, False otherwise
+        """
+        return 0 <= cell[0] < self.height and 0 <= cell[1] < self.width and self.grid[cell[0], cell[1]] == 1
+
+    def actions(self, cell):
+        """
+        Given a cell returns the moves leading to a reachable neighbour. The moves of each cell are computed
+        once from the occupancy grid and then cached.
+        :param cell: a (row, column) tuple
+        :return: a list of actions
+        """
+        if self.walls_stamp != self.stamp():
+            self.sync()
+        actions = self.cell_actions.get(cell)
+        if actions is None:
+            actions = [a for a, (dr, dc) in self.moves.items() if self.is_free((cell[0] + dr, cell[1] + dc))]
+            self.cell_actions[cell] = actions
+        return actions
+
+    def add_wall(self, cell):
+        """
+        Puts a wall in a cell, keeping the occupancy grid and the cached moves up to date
+        :param cell: a (row, column) tuple
+        """
+        cell = tuple(cell)
+        if self.grid[cell[0], cell[1]] == 2:
+            return
+        self.p_walls.insert(self.n_walls, cell)  # <- only the first n_walls walls of the list are in the maze
+        self.n_walls += 1
+        self.walls_stamp = self.stamp()
+        self.occupancy[cell[0], cell[1]] = 2
+        self.invalidate(cell)
+        self.notify(cell)
+        if self.components is not None:
+            self.labels[cell[0], cell[1]] = -1
+            self.split(cell)
+
+    def split(self, cell):
+        """
+        Updates the components after a wall was put in a cell. The free neighbours of the cell may now be
+        disconnected: a bounded search from each of them looks for the others, and the cells it exhausts without
+        finding them are a new component. When the search stops at the bound the components are left as they are,
+        so they may join cells that are no longer connected (connected then answers True and the search proves it).
+        :param cell: a (row, column) tuple
+        """
+        neighbours = [(cell[0] + dr, cell[1] + dc) for dr, dc in self.moves.values()]
+        neighbours = [n for n in neighbours if self.is_free(n)]
+        while len(neighbours) >= 2:
+            start = neighbours.pop()
+            seen = {start}
+            frontier = deque([start])
+            while frontier and neighbours and len(seen) <= self.split_cells:
+                r, c = frontier.popleft()
+                for dr, dc in self.moves.values():
+                    n = (r + dr, c + dc)
+                    if n not in seen and self.is_free(n):
+                        seen.add(n)
+                        frontier.append(n)
+                neighbours = [n for n in neighbours if n not in seen]
+            if frontier or not neighbours:
+                continue  # <- bound reached, or no split on this side
+            # the search exhausted the cells of start without reaching the other neighbours
+            rows, cols = zip(*seen)
+            self.labels[list(rows), list(cols)] = self.components.add()
+
+    def remove_wall(self, cell):
+        """
+        Removes the wall from a cell, keeping the occupancy grid and the cached moves up to date
+        :param cell: a (row, column) tuple
+        """
+        cell = tuple(cell)
+        if self.grid[cell[0], cell[1]] != 2:
+            return
+        self.p_walls.remove(cell)
+        self.n_walls -= 1
+        self.walls_stamp = self.stamp()
+        self.occupancy[cell[0], cell[1]] = 1
+        self.invalidate(cell)
+        self.notify(cell)
+        if self.components is not None:
+            # the freed cell joins the components of its free neighbours
+            label = self.labels[cell[0], cell[1]] = self.components.add()
+            for dr, dc in self.moves.values():
+                r, c = cell[0] + dr, cell[1] + dc
+                if 0 <= r < self.height and 0 <= c < self.width and self.labels[r, c] >= 0:
+                    self.components.union(label, int(self.labels[r, c]))
+
+    def build_components(self):
+        """
+        Computes the connected components of the free cells. The cells of each horizontal run of free cells
+        share an element, so only the vertical contacts between runs need to be merged.
+        """
+        free = self.grid == 1
+        # a run starts on a free cell whose left neighbour is not free
+        starts = free & ~np.pad(free, ((0, 0), (1, 0)))[:, :-1]
+        runs = np.cumsum(starts.ravel()).reshape(free.shape) - 1
+        self.labels = np.where(free, runs, -1)
+        self.components = UnionFind(int(starts.sum()))
+        vertical = free[:-1, :] & free[1:, :]
+        pairs = np.stack([self.labels[:-1, :][vertical], self.labels[1:, :][vertical]], axis=1)
+        for a, b in np.unique(pairs, axis=0).tolist():
+            self.components.union(a, b)
+
+    def connected(self, start, end):
+        """
+        Checks if two cells belong to the same connected component of the free cells
+        :param start: a (row, column) tuple
+        :param end: a (row, column) tuple
+        :return: False if the cells are surely disconnected, True otherwise
+        """
+        if start == end:
+            return True
+        if not self.is_free(start) or not self.is_free(end):
+            return False
+        if self.components is None:
+            self.build_components()
+        return self.components.connected(int(self.labels[start[0], start[1]]), int(self.labels[end[0], end[1]]))
+
+    def invalidate(self, cell):
+        # the moves of a cell depend only on its neighbours
+        self.cell_actions.pop(cell, None)
+        for dr, dc in self.moves.values():
+            self.cell_actions.pop((cell[0] + dr, cell[1] + dc), None)
+
+    def subscribe(self, listener):
+        """
+        Registers a function to be called whenever a wall is added or removed, e.g. to invalidate the
+        data precomputed on the maze
+        :param listener: a function taking the changed (row, column) cell
+        """
+        self.listeners.append(listener)
+
+    def notify(self, cell):
+        for listener in self.listeners:
+            listener(cell)
+
+
+def random_maze(height, width, density, seed=None, initial_state=(0, 0), goal_state=None, solvable=True):
+    """
+    Generates a maze with randomly placed walls
+    :param height: number of rows
+    :param width: number of columns
+    :param density: fraction of the cells occupied by walls
+    :param seed: seed of the random generator, for reproducible mazes
+    :param initial_state: a cell that is never a wall
+    :param goal_state: a cell that is never a wall (by default the opposite corner)
+    :param solvable: if True, a random monotone path from the initial state to the goal state is kept free
+    :return: a Maze
+    """
+    rng = random.Random(seed)
+    if goal_state is None:
+        goal_state = (height - 1, width - 1)
+
+    reserved = {initial_state, goal_state}
+    if solvable:
+        # shuffle the vertical and horizontal moves needed to reach the goal and keep their cells free
+        dr = 1 if goal_state[0] >= initial_state[0] else -1
+        dc = 1 if goal_state[1] >= initial_state[1] else -1
+        steps = [(dr, 0)] * abs(goal_state[0] - initial_state[0]) + [(0, dc)] * abs(goal_state[1] - initial_state[1])
+        rng.shuffle(steps)
+        cell = initial_state
+        for step in steps:
+            cell = (cell[0] + step[0], cell[1] + step[1])
+            reserved.add(cell)
+
+    candidates = [(r, c) for r in range(height) for c in range(width) if (r, c) not in reserved]
+    p_walls = rng.sample(candidates, min(len(candidates), int(density * height * width)))
+    return Maze(height, width, len(p_walls), p_walls)
@@ -1,4 +1,6 @@
-from search.Node import Node
+import math
+from search.fringe import ArenaFringe
+from search.Node import root_node, state_key, surely_unreachable
 
 
 class GraphSearch:
@@ -6,11 +8,15 @@ class GraphSearch:
     A class able to find a solution with a given search strategy
     """
 
-    def __init__(self, problem, strategy=None):
+    def __init__(self, problem, strategy=None, arena=False):
         self.problem = problem
         self.strategy = strategy
-        self.fringe = []
-        self.visited = []  # <- The list containing the visited states
+        self.arena = arena  # <- store the nodes in a NodeArena instead of separate objects
+        self.fringe = None
+        self.expanded = 0  # <- number of expanded nodes
+        self.max_fringe = 0  # <- peak size of the fringe
+        self.visited = set()  # <- The set containing the keys of the visited states
+        self.best = {}  # <- The best known cost to reach each state
 
     def __repr__(self):
         return 'Graph Search'
@@ -20,12 +26,35 @@ class GraphSearch:
         Run the search
         :return: a path or a failure
         """
+        steps = self.steps()
+        try:
+            while True:
+                next(steps)
+        except StopIteration as stop:
+            return stop.value
 
-        node = Node(state=self.problem.initial_state,
-                    parent=None,
-                    action=None,
-                    cost=0,
-                    depth=0)
+    def steps(self, every=None):
+        """
+        Run the search a few expansions at a time: a generator pausing every given number of expanded nodes,
+        so that the search can be interleaved with other work (e.g., by an event loop)
+        :param every: number of expansions between two pauses (None to never pause)
+        :return: the path or the failure (as the value of the StopIteration)
+        """
+        key = state_key(self.problem)
+        # with cost-ordered strategies a state is re-opened whenever a cheaper path to it is found
+        decrease_key = getattr(self.strategy, 'decrease_key', False)
+
+        if surely_unreachable(self.problem):
+            return 'Fail', []
+        node = root_node(self.problem, arena=self.arena)
+        self.fringe = self.strategy.fringe()
+        if self.arena:
+            # the fringe holds the indices of the nodes in the arena
+            self.fringe = ArenaFringe(self.fringe, node.arena)
+        self.expanded = 0
+        self.max_fringe = 0
+        self.visited = set()
+        self.best = {key(node.state): 0}
 
         # search loop
         while True:
@@ -34,29 +63,36 @@ class GraphSearch:
                 return 'Ok', node
 
             # add visited for the graph search
-            self.visited.append(node.state)
+            self.visited.add(key(node.state))
 
             # expand the node
             new_states = self.problem.successors(node.state)
-            new_nodes = [node.expand(state=s,
-                                     action=a,
-                                     cost=self.problem.cost(node.state, a)) for s, a in new_states]
-
-            # we retain the states not already visited!
-            new_nodes = [n for n in new_nodes if n.state not in self.visited]
-            self.fringe = [n for n in self.fringe if n.state not in self.visited]
+            self.expanded += 1
+            if every and self.expanded % every == 0:
+                yield
+            for s, a in new_states:
+                k = key(s)
+                cost = self.problem.cost(node.state, a)
+                if decrease_key:
+                    # we retain the states reached with a lower cost than the best known one
+                    if node.cost + cost >= self.best.get(k, math.inf):
+                        continue
+                    self.best[k] = node.cost + cost
+                    self.visited.discard(k)
+                elif k in self.visited:
+                    # we retain the states not already visited!
+                    continue
+                self.fringe.push(node.expand(state=s,
+                                             action=a,
+                                             cost=cost))
+            self.max_fringe = max(self.max_fringe, len(self.fringe))
 
-            self.fringe = self.fringe + new_nodes
-
-            if len(self.fringe) != 0:
-                self.fringe, node = self.strategy.select(self.fringe)
-                if node is None:
-                    return 'Fail', []
+            # the nodes in the fringe whose state has been visited (or reached with a lower cost)
+            # in the meantime are discarded when popped
+            while len(self.fringe) != 0:
+                node = self.fringe.pop()
+                k = key(node.state)
+                if k not in self.visited and not (decrease_key and node.cost > self.best[k]):
+                    break
             else:
-                if self.problem.goal_test(node.state):
-                    return 'Ok', node
-                else:
-                    return 'Fail', []
-
-
-
+                return 'Fail', []
@@ -0,0 +1,257 @@
+import heapq
+import itertools
+import math
+import multiprocessing
+import queue
+import time
+import zlib
+from search.Node import rebuild, state_key, surely_unreachable
+
+
+def owner(key, workers):
+    """
+    Assigns a state to a worker hashing its key. The hash must not depend on the process (as the built-in hash
+    of strings does), so it is the CRC32 of the representation of the key.
+    :param key: the key of a state
+    :param workers: the number of workers
+    :return: the index of the worker owning the state
+    """
+    return zlib.crc32(repr(key).encode()) % workers
+
+
+def work(index, problem, h, inboxes, outbox, batch, interval):
+    """
+    The loop of a worker process: it expands the best nodes of its own fringe and sends the successors owned by the
+    other workers. It answers the probes of the termination detection and the requests of the parents of its
+    states, until it is stopped.
+    A successor is sent at once when it is at least as good as the best node of the local fringe (its owner may
+    have nothing better to expand), the others are buffered and sent when the worker goes idle or every interval.
+    :param index: the index of the worker
+    :param problem: the problem
+    :param h: the heuristic
+    :param inboxes: the queue of each worker
+    :param outbox: the queue of the coordinator
+    :param batch: the number of expansions between two checks of the inbox
+    :param interval: the seconds between two sends of the buffered successors
+    """
+    key = state_key(problem)
+    workers = len(inboxes)
+    fringe = []  # <- (f, -g, counter, state) of the states owned by the worker: ties go to the deepest node
+    best = {}  # <- key -> lowest cost found
+    parents = {}  # <- key -> (parent state, action) of the cheapest path found
+    counter = itertools.count()
+    incumbent = math.inf  # <- cost of the best solution found by any worker
+    sent = received = expanded = 0
+    outgoing = [[] for _ in range(workers)]  # <- successors waiting to be sent to their owners
+    deadline = time.perf_counter() + interval  # <- next send of the buffered successors
+
+    def insert(g, state, parent, action):
+        k = key(state)
+        if g < best.get(k, math.inf):
+            best[k] = g
+            parents[k] = (parent, action)
+            heapq.heappush(fringe, (g + h(state), -g, next(counter), state))
+
+    def send(i):
+        nonlocal sent
+        if outgoing[i]:
+            inboxes[i].put(('nodes', outgoing[i]))
+            outgoing[i] = []
+            sent += 1
+
+    def send_all():
+        nonlocal deadline
+        for i in range(workers):
+            send(i)
+        deadline = time.perf_counter() + interval
+
+    while True:
+        idle = not fringe or fringe[0][0] >= incumbent
+        messages = []
+        try:
+            # an idle worker waits for messages, a busy one only collects the pending ones
+            messages.append(inboxes[index].get(timeout=0.05) if idle else inboxes[index].get_nowait())
+            while True:
+                messages.append(inboxes[index].get_nowait())
+        except queue.Empty:
+            pass
+
+        probes = []
+        for message in messages:
+            kind = message[0]
+            if kind == 'nodes':
+                received += 1
+                for node in message[1]:
+                    insert(*node)
+            elif kind == 'incumbent':
+                incumbent = min(incumbent, message[1])
+            elif kind == 'probe':
+                probes.append(message[1])
+            elif kind == 'parent':
+                outbox.put(('parent', *parents[key(message[1])]))
+            elif kind == 'stop':
+                return
+        idle = not fringe or fringe[0][0] >= incumbent
+        if idle or time.perf_counter() >= deadline:
+            send_all()  # <- an idle worker keeps no successor, or the termination would be detected too early
+        if probes:
+            for wave in probes:
+                outbox.put(('status', index, wave, idle, sent, received, expanded))
+
+        for _ in range(batch):
+            if not fringe or fringe[0][0] >= incumbent:
+                break
+            _, minus_g, _, state = heapq.heappop(fringe)
+            g = -minus_g
+            if g > best[key(state)]:
+                continue
+            if problem.goal_test(state):
+                incumbent = g
+                outbox.put(('goal', g, state))
+                continue
+            expanded += 1
+            remote = []
+            for s, a in problem.successors(state):
+                i = owner(key(s), workers)
+                node = (g + problem.cost(state, a), s, state, a)
+                if i == index:
+                    insert(*node)  # <- the worker's own states need no message
+                else:
+                    outgoing[i].append(node)
+                    remote.append((node[0] + h(s), i))
+            for f, i in remote:
+                if not fringe or f <= fringe[0][0]:
+                    send(i)  # <- a promising successor is not kept waiting behind the local expansions
+        if not fringe or fringe[0][0] >= incumbent or time.perf_counter() >= deadline:
+            send_all()
+
+class HDAStar:
+    """
+    Hash distributed AStar: the states are split among worker processes by hashing, each worker keeps the fringe
+    and the best costs of its own states, and the successors are sent to their owners: at once the promising ones, buffered the others. When a solution
+    is found its cost is broadcast, and the workers discard the nodes that cannot lead to a cheaper one.
+    The search ends when all the workers are idle and no message is in flight, which is detected with two
+    consecutive waves of probes reporting the same, balanced, numbers of sent and received messages (the
+    four counter method). The path is then traced back asking each state's owner for its parent.
+    """
+
+    def __init__(self, problem, workers=4, batch=64, h=None, interval=0.005):
+        self.problem = problem
+        self.workers = workers
+        self.batch = batch  # <- expansions between two checks of the inbox of a worker
+        self.interval = interval  # <- seconds between two sends of the successors buffered by a worker
+        self.h = h  # <- heuristic replacing the one of the problem
+        self.expanded = 0
+        self.loads = []  # <- expanded nodes of each worker
+
+    def __repr__(self):
+        return 'Hash Distributed AStar Search'
+
+    def run(self):
+        """
+        Run the search
+        :return: a path or a failure
+        """
+        self.expanded = 0
+        self.loads = []
+        if surely_unreachable(self.problem):
+            return 'Fail', []
+
+        key = state_key(self.problem)
+        h = self.problem.h if self.h is None else self.h
+        inboxes = [multiprocessing.Queue() for _ in range(self.workers)]
+        outbox = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=work, args=(i, self.problem, h, inboxes, outbox, self.batch,
+                                                                 self.interval),
+                                             daemon=True)
+                     for i in range(self.workers)]
+        for p in processes:
+            p.start()
+
+        try:
+            start = self.problem.initial_state
+            inboxes[owner(key(start), self.workers)].put(('nodes', [(0, start, None, None)]))
+            cost, goal = self.detect_termination(inboxes, outbox, processes)
+            if goal is None:
+                return 'Fail', []
+            steps = self.trace(goal, inboxes, outbox, processes)
+        finally:
+            for inbox in inboxes:
+                inbox.put(('stop',))
+            for p in processes:
+                p.join(timeout=1)
+                if p.is_alive():
+                    p.terminate()
+
+        return 'Ok', rebuild(self.problem, [action for _, action in steps])
+
+    @staticmethod
+    def receive(outbox, processes):
+        """
+        Waits for a message of the workers, polling them to notice the ones that die (e.g., when out of memory)
+        :param outbox: the queue of the coordinator
+        :param processes: the worker processes
+        :return: the message
+        """
+        while True:
+            try:
+                return outbox.get(timeout=0.1)
+            except queue.Empty:
+                for i, p in enumerate(processes):
+                    if p.exitcode is not None:
+                        raise RuntimeError(f'HDA* worker {i} died with exit code {p.exitcode}')
+
+    def detect_termination(self, inboxes, outbox, processes):
+        """
+        Collects the solutions found by the workers until the search is over
+        :return: the cost of the best solution and its goal state (None if no solution exists)
+        """
+        incumbent, goal = math.inf, None
+        wave, replies, previous = 0, [], None
+        for inbox in inboxes:
+            inbox.put(('probe', wave))
+        while True:
+            kind, *content = self.receive(outbox, processes)
+            if kind == 'goal':
+                if content[0] < incumbent:
+                    incumbent, goal = content
+                    for inbox in inboxes:
+                        inbox.put(('incumbent', incumbent))
+            elif kind == 'status' and content[1] == wave:
+                replies.append(content)
+                if len(replies) < self.workers:
+                    continue
+                idle = all(r[2] for r in replies)
+                sent = 1 + sum(r[3] for r in replies)  # <- the coordinator sent the initial state
+                received = sum(r[4] for r in replies)
+                counters = (sent, received) if idle and sent == received else None
+                if counters is not None and counters == previous:
+                    self.loads = [r[5] for r in sorted(replies)]
+                    self.expanded = sum(self.loads)
+                    return incumbent, goal
+                previous = counters
+                wave, replies = wave + 1, []
+                if counters is None:
+                    time.sleep(0.005)  # <- the workers are busy: do not flood them with probes
+                for inbox in inboxes:
+                    inbox.put(('probe', wave))
+
+    def trace(self, goal, inboxes, outbox, processes):
+        """
+        Rebuilds the path to the goal asking the owner of each state for its parent
+        :return: the list of (state, action) from the successor of the initial state to the goal
+        """
+        key = state_key(self.problem)
+        steps = []
+        state = goal
+        while True:
+            inboxes[owner(key(state), self.workers)].put(('parent', state))
+            kind, *content = self.receive(outbox, processes)
+            while kind != 'parent':  # <- late messages of the search
+                kind, *content = self.receive(outbox, processes)
+            parent, action = content
+            if parent is None:
+                break
+            steps.append((state, action))
+            state = parent
+        return steps[::-1]
@@ -0,0 +1,270 @@
+import heapq
+import math
+from collections import deque
+from search.Node import rebuild, surely_unreachable
+
+
+class MazeAbstraction:
+    """
+    A hierarchical abstraction of a Maze for HPA* queries on very large grids. The grid is split in square
+    clusters; along the border between two clusters each run of free cell pairs gives one transition (two, at its
+    ends, for long runs). The cells of the transitions are the nodes of an abstract graph whose edges are the
+    transitions themselves and the distances between the nodes of the same cluster.
+    The graph of a cluster is built the first time a query reaches it and it is dropped when a wall of the
+    cluster (or of its borders) changes, so only the clusters touched by the queries are ever preprocessed.
+    """
+
+    def __init__(self, maze, cluster_size=16, max_entrance=6):
+        self.maze = maze
+        self.cluster_size = cluster_size
+        self.max_entrance = max_entrance  # <- runs at least this long get a transition at each end
+        self.rows = math.ceil(maze.height / cluster_size)
+        self.cols = math.ceil(maze.width / cluster_size)
+        self.borders = {}  # <- (cluster, right or lower cluster) -> [(cell, cell)] transitions
+        self.graphs = {}  # <- cluster -> {node: [(node, distance)]}
+        self.builds = 0  # <- number of cluster graphs built
+        maze.subscribe(self.invalidate)
+
+    def __repr__(self):
+        return 'Maze Abstraction'
+
+    def cluster(self, cell):
+        return cell[0] // self.cluster_size, cell[1] // self.cluster_size
+
+    def bounds(self, cluster):
+        """
+        :return: the first and past-the-last row, the first and past-the-last column of a cluster
+        """
+        r0, c0 = cluster[0] * self.cluster_size, cluster[1] * self.cluster_size
+        return r0, min(r0 + self.cluster_size, self.maze.height), c0, min(c0 + self.cluster_size, self.maze.width)
+
+    def border(self, first, second):
+        """
+        Finds the transitions between two adjacent clusters
+        :param first: a cluster
+        :param second: the cluster at its right or below it
+        :return: a list of (cell of the first cluster, cell of the second cluster)
+        """
+        transitions = self.borders.get((first, second))
+        if transitions is None:
+            r0, r1, c0, c1 = self.bounds(first)
+            grid = self.maze.grid
+            if first[0] == second[0]:
+                pairs = [((r, c1 - 1), (r, c1)) for r in range(r0, r1)]
+                free = ((grid[r0:r1, c1 - 1] == 1) & (grid[r0:r1, c1] == 1)).tolist()
+            else:
+                pairs = [((r1 - 1, c), (r1, c)) for c in range(c0, c1)]
+                free = ((grid[r1 - 1, c0:c1] == 1) & (grid[r1, c0:c1] == 1)).tolist()
+            transitions, run = [], []
+            for pair, both_free in zip(pairs + [None], free + [False]):
+                if both_free:
+                    run.append(pair)
+                    continue
+                if len(run) >= self.max_entrance:
+                    transitions += [run[0], run[-1]]
+                elif run:
+                    transitions.append(run[len(run) // 2])
+                run = []
+            self.borders[(first, second)] = transitions
+        return transitions
+
+    def graph(self, cluster):
+        """
+        Returns the abstract graph of a cluster, building it if needed
+        :param cluster: a (row, column) cluster
+        :return: a dictionary node -> [(adjacent node, distance)]
+        """
+        graph = self.graphs.get(cluster)
+        if graph is None:
+            graph = {}
+            r, c = cluster
+            # transitions towards the neighbouring clusters
+            if c + 1 < self.cols:
+                for a, b in self.border(cluster, (r, c + 1)):
+                    graph.setdefault(a, []).append((b, 1))
+            if r + 1 < self.rows:
+                for a, b in self.border(cluster, (r + 1, c)):
+                    graph.setdefault(a, []).append((b, 1))
+            if c > 0:
+                for a, b in self.border((r, c - 1), cluster):
+                    graph.setdefault(b, []).append((a, 1))
+            if r > 0:
+                for a, b in self.border((r - 1, c), cluster):
+                    graph.setdefault(b, []).append((a, 1))
+            # distances inside the cluster, with visits on the flat indices of its cells
+            r0, r1, c0, c1 = self.bounds(cluster)
+            w, n = c1 - c0, (r1 - r0) * (c1 - c0)
+            free = (self.maze.grid[r0:r1, c0:c1] == 1).ravel().tolist()
+            adjacency = [[j for j in (i - w, i + w, i - 1 if i % w else -1, i + 1 if (i + 1) % w else -1)
+                          if 0 <= j < n and free[j]] for i in range(n)]
+            nodes = list(graph)
+            index = {(node[0] - r0) * w + node[1] - c0: node for node in nodes}
+            for node in nodes:
+                source = (node[0] - r0) * w + node[1] - c0
+                distances = [-1] * n
+                distances[source] = 0
+                fringe = deque([source])
+                missing = len(index) - 1
+                while fringe and missing:
+                    i = fringe.popleft()
+                    for j in adjacency[i]:
+                        if distances[j] < 0:
+                            distances[j] = distances[i] + 1
+                            fringe.append(j)
+                            if j in index:
+                                missing -= 1
+                graph[node].extend((other, distances[i]) for i, other in index.items()
+                                   if i != source and distances[i] >= 0)
+            self.graphs[cluster] = graph
+            self.builds += 1
+        return graph
+
+    def preprocess(self):
+        """
+        Builds the graphs of all the clusters at once, instead of when the queries reach them
+        """
+        for r in range(self.rows):
+            for c in range(self.cols):
+                self.graph((r, c))
+
+    def local_search(self, cell, cluster):
+        """
+        A breadth first visit of the free cells of a cluster
+        :param cell: the starting cell
+        :param cluster: the cluster the visit is confined to
+        :return: a dictionary cell -> distance and a dictionary cell -> previous cell
+        """
+        r0, r1, c0, c1 = self.bounds(cluster)
+        free = (self.maze.grid[r0:r1, c0:c1] == 1).tolist()
+        distances, parents = {cell: 0}, {cell: None}
+        fringe = deque([cell])
+        while fringe:
+            current = fringe.popleft()
+            d = distances[current] + 1
+            for dr, dc in self.maze.moves.values():
+                r, c = current[0] + dr, current[1] + dc
+                if r0 <= r < r1 and c0 <= c < c1 and free[r - r0][c - c0] and (r, c) not in distances:
+                    distances[(r, c)] = d
+                    parents[(r, c)] = current
+                    fringe.append((r, c))
+        return distances, parents
+
+    def invalidate(self, cell):
+        """
+        Drops the data depending on a cell whose wall changed: the graph of its cluster and, if the cell lies
+        on the edge of the cluster, the transitions of that border and the graph of the cluster beyond it
+        """
+        cluster = self.cluster(cell)
+        self.graphs.pop(cluster, None)
+        r0, r1, c0, c1 = self.bounds(cluster)
+        r, c = cluster
+        if cell[0] == r0 and r > 0:
+            self.borders.pop(((r - 1, c), cluster), None)
+            self.graphs.pop((r - 1, c), None)
+        if cell[0] == r1 - 1 and r + 1 < self.rows:
+            self.borders.pop((cluster, (r + 1, c)), None)
+            self.graphs.pop((r + 1, c), None)
+        if cell[1] == c0 and c > 0:
+            self.borders.pop(((r, c - 1), cluster), None)
+            self.graphs.pop((r, c - 1), None)
+        if cell[1] == c1 - 1 and c + 1 < self.cols:
+            self.borders.pop((cluster, (r, c + 1)), None)
+            self.graphs.pop((r, c + 1), None)
+
+
+class HierarchicalSearch:
+    """
+    HPA* search for the MazeProblem: the path is planned on the abstract graph of a MazeAbstraction, joined to
+    the initial and goal cells by visits of their clusters, and then refined cluster by cluster into unit moves.
+    Paths are near-optimal: they may be slightly longer than the shortest ones, since they cross the borders
+    only at the transitions.
+    """
+
+    def __init__(self, problem, abstraction):
+        self.problem = problem
+        self.abstraction = abstraction
+        self.expanded = 0
+
+    def __repr__(self):
+        return 'Hierarchical Search (HPA*)'
+
+    def h(self, cell):
+        goal = self.problem.goal_state
+        return abs(cell[0] - goal[0]) + abs(cell[1] - goal[1])
+
+    def abstract_path(self):
+        """
+        AStar on the abstract graph, extended with the initial and the goal cells
+        :return: the list of the abstract nodes from the initial cell to the goal cell, or None
+        """
+        abstraction = self.abstraction
+        start, goal = self.problem.initial_state, self.problem.goal_state
+        start_cluster, goal_cluster = abstraction.cluster(start), abstraction.cluster(goal)
+
+        # edges from the initial cell and towards the goal cell
+        distances, _ = abstraction.local_search(start, start_cluster)
+        start_edges = [(n, distances[n]) for n in abstraction.graph(start_cluster) if n in distances]
+        if goal in distances:
+            start_edges.append((goal, distances[goal]))
+        distances, _ = abstraction.local_search(goal, goal_cluster)
+        goal_edges = {n: distances[n] for n in abstraction.graph(goal_cluster) if n in distances}
+
+        best = {start: 0}
+        parents = {start: None}
+        fringe = [(self.h(start), 0, start)]
+        while fringe:
+            _, cost, node = heapq.heappop(fringe)
+            if cost > best[node]:
+                continue
+            if node == goal:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = parents[node]
+                return path[::-1]
+            self.expanded += 1
+            edges = list(abstraction.graph(abstraction.cluster(node)).get(node, ()))
+            if node == start:
+                edges += start_edges
+            if node in goal_edges:
+                edges.append((goal, goal_edges[node]))
+            for n, d in edges:
+                if cost + d < best.get(n, math.inf):
+                    best[n] = cost + d
+                    parents[n] = node
+                    heapq.heappush(fringe, (cost + d + self.h(n), cost + d, n))
+        return None
+
+    def run(self):
+        """
+        Run the search
+        :return: a path or a failure
+        """
+        self.expanded = 0
+        if surely_unreachable(self.problem):
+            return 'Fail', []
+        maze = self.problem.environment
+        start, goal = self.problem.initial_state, self.problem.goal_state
+        if not maze.is_free(start) or not maze.is_free(goal):
+            return 'Fail', []
+        path = self.abstract_path()
+        if path is None:
+            return 'Fail', []
+
+        # refine each abstract edge into unit moves
+        moves = {step: action for action, step in maze.moves.items()}
+        actions = []
+        for a, b in zip(path, path[1:]):
+            if abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1:
+                cells = [b]
+            else:
+                _, parents = self.abstraction.local_search(a, self.abstraction.cluster(a))
+                cells = []
+                while b != a:
+                    cells.append(b)
+                    b = parents[b]
+                cells.reverse()
+            for cell in cells:
+                actions.append(moves[(cell[0] - a[0], cell[1] - a[1])])
+                a = cell
+        return 'Ok', rebuild(self.problem, actions)
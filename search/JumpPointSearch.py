@@ -0,0 +1,116 @@
+import math
+from search.Node import Node, rebuild, surely_unreachable
+from search.fringe import PriorityFringe
+
+
+class JumpPointSearch:
+    """
+    Jump Point Search (4-connected variant) for the MazeProblem. It is an AStar search which, instead of
+    adding every neighbour to the fringe, moves straight along each direction and only stops on the cells
+    where the optimal paths may turn (the jump points), skipping the many symmetric paths of a grid.
+    """
+
+    def __init__(self, problem):
+        self.problem = problem
+        self.expanded = 0
+
+    def __repr__(self):
+        return 'Jump Point Search'
+
+    def run(self):
+        """
+        Run the search
+        :return: a path or a failure
+        """
+        if surely_unreachable(self.problem):
+            return 'Fail', []
+        maze = self.problem.environment
+        height, width = maze.height, maze.width
+        rows = (maze.grid == 1).tolist()
+        goal = self.problem.goal_state
+        self.expanded = 0
+
+        def free(r, c):
+            return 0 <= r < height and 0 <= c < width and rows[r][c]
+
+        def jump(r, c, dr, dc):
+            # move from (r, c) along (dr, dc) until a jump point, a wall or the border of the maze
+            while free(r, c):
+                if (r, c) == goal:
+                    return r, c
+                if dc != 0:
+                    # a neighbour above or below becomes reachable only through this cell
+                    if (free(r - 1, c) and not free(r - 1, c - dc)) or (free(r + 1, c) and not free(r + 1, c - dc)):
+                        return r, c
+                else:
+                    if (free(r, c - 1) and not free(r - dr, c - 1)) or (free(r, c + 1) and not free(r - dr, c + 1)):
+                        return r, c
+                    # moving vertically, a horizontal jump point may start from this cell
+                    if jump(r, c + 1, 0, 1) is not None or jump(r, c - 1, 0, -1) is not None:
+                        return r, c
+                r, c = r + dr, c + dc
+            return None
+
+        def directions(node):
+            # pruned neighbours: the direction of arrival and the ones orthogonal to the horizontal moves
+            if node.parent is None:
+                return [(-1, 0), (1, 0), (0, -1), (0, 1)]
+            dr = (node.state[0] > node.parent.state[0]) - (node.state[0] < node.parent.state[0])
+            dc = (node.state[1] > node.parent.state[1]) - (node.state[1] < node.parent.state[1])
+            if dc != 0:
+                return [(-1, 0), (1, 0), (0, dc)]
+            return [(0, -1), (0, 1), (dr, 0)]
+
+        start = Node(state=self.problem.initial_state,
+                     parent=None,
+                     action=None,
+                     cost=0,
+                     depth=0)
+        # among the jump points with the same evaluation, the ones closer to the goal come first
+        fringe = PriorityFringe(key=lambda x: (x.cost + self.problem.h(x.state), self.problem.h(x.state)))
+        fringe.push(start)
+        best = {start.state: 0}
+        closed = set()
+        while len(fringe) != 0:
+            node = fringe.pop()
+            if node.state in closed or node.cost > best[node.state]:
+                continue
+            if node.state == goal:
+                return 'Ok', self.unfold(node)
+            closed.add(node.state)
+            self.expanded += 1
+
+            r, c = node.state
+            for dr, dc in directions(node):
+                if not free(r + dr, c + dc):
+                    continue
+                point = jump(r + dr, c + dc, dr, dc)
+                if point is None:
+                    continue
+                cost = node.cost + abs(point[0] - r) + abs(point[1] - c)
+                if cost < best.get(point, math.inf):
+                    best[point] = cost
+                    closed.discard(point)
+                    fringe.push(node.expand(state=point, action=None, cost=cost - node.cost))
+        return 'Fail', []
+
+    def unfold(self, node):
+        """
+        Turns a chain of jump points into a chain of nodes moving one cell at a time
+        :param node: the node of the goal jump point
+        :return: a node whose path is made of the actions of the problem
+        """
+        points = []
+        while node is not None:
+            points.append(node.state)
+            node = node.parent
+        points = list(reversed(points))
+
+        moves = {step: action for action, step in self.problem.environment.moves.items()}
+        actions = []
+        for a, b in zip(points, points[1:]):
+            # a jump is a straight move of one or more cells
+            dr = (b[0] > a[0]) - (b[0] < a[0])
+            dc = (b[1] > a[1]) - (b[1] < a[1])
+            actions += [moves[(dr, dc)]] * max(abs(b[0] - a[0]), abs(b[1] - a[1]))
+        return rebuild(self.problem, actions)
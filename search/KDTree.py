@@ -0,0 +1,159 @@
+import numpy as np
+
+EARTH_RADIUS = 6371.0  # <- KM, as in the haversine metric of Roads
+
+
+class KDTree:
+    """
+    A k-d tree over the coordinates of a road map, for snapping raw (latitude, longitude) positions to the nearest
+    cities. Each inner node splits its points at the median of the coordinate with the largest spread; the leaves
+    hold a few points, scanned with array operations. Distances follow the metric of the map (KM): with the flat
+    metric the points are the coordinates scaled to KM, with the haversine one they are placed on the sphere of
+    the Earth, where the nearest point along the chord is also the nearest along the great circle.
+    """
+
+    def __init__(self, points, names=None, leaf_size=16, metric='flat'):
+        self.metric_name = metric
+        points = self.project(points)
+        self.names = names if names is not None else list(range(len(points)))
+        self.leaf_size = leaf_size
+        self.order = np.arange(len(points))
+        # node arrays: range of the node in order, split coordinate (-1 for a leaf), split value, children
+        self.lo, self.hi, self.axis, self.split, self.left, self.right = [], [], [], [], [], []
+
+        stack = [(0, len(points), None, None)]  # <- (lo, hi, parent, is left child)
+        while stack:
+            lo, hi, parent, is_left = stack.pop()
+            node = len(self.lo)
+            if parent is not None:
+                (self.left if is_left else self.right)[parent] = node
+            self.lo.append(lo)
+            self.hi.append(hi)
+            self.left.append(-1)
+            self.right.append(-1)
+            if hi - lo <= leaf_size:
+                self.axis.append(-1)
+                self.split.append(0.0)
+                continue
+            chunk = points[self.order[lo:hi]]
+            axis = int(np.argmax(chunk.max(axis=0) - chunk.min(axis=0)))
+            mid = (lo + hi) // 2
+            self.order[lo:hi] = self.order[lo:hi][np.argpartition(chunk[:, axis], mid - lo)]
+            self.axis.append(axis)
+            self.split.append(float(points[self.order[mid], axis]))
+            stack.append((mid, hi, node, False))
+            stack.append((lo, mid, node, True))
+
+        self.points = points[self.order]  # <- points in tree order, so that each leaf is a contiguous slice
+
+    def __len__(self):
+        return len(self.points)
+
+    def project(self, coordinates):
+        """
+        Maps (latitude, longitude) pairs to the points of the tree, whose euclidean distance is the distance of the
+        metric (flat) or grows with it (haversine)
+        :param coordinates: a list (or array) of (latitude, longitude) pairs
+        :return: an array of points
+        """
+        coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+        if self.metric_name == 'flat':
+            return coordinates * 111  # <- *111 to convert degrees in KM, as the flat metric does
+        lat, long = np.radians(coordinates[:, 0]), np.radians(coordinates[:, 1])
+        return EARTH_RADIUS * np.stack([np.cos(lat) * np.cos(long), np.cos(lat) * np.sin(long), np.sin(lat)], axis=1)
+
+    def to_distance(self, chord):
+        """
+        Converts the euclidean distance of two points of the tree to the distance of the metric (KM)
+        """
+        if self.metric_name == 'flat':
+            return chord
+        return 2 * EARTH_RADIUS * np.arcsin(np.minimum(chord / (2 * EARTH_RADIUS), 1.0))
+
+    def to_chord(self, distance):
+        """
+        Converts a distance of the metric (KM) to the euclidean distance of two points of the tree
+        """
+        if self.metric_name == 'flat':
+            return distance
+        return 2 * EARTH_RADIUS * np.sin(min(distance, np.pi * EARTH_RADIUS) / (2 * EARTH_RADIUS))
+
+    @classmethod
+    def from_roads(cls, roads, leaf_size=16):
+        """
+        Builds the index of the cities of a Roads map
+        :param roads: a Roads map
+        :param leaf_size: maximum number of points of a leaf
+        :return: a KDTree whose names are the cities, measuring distances with the metric of the map
+        """
+        names = list(roads.coordinates)
+        return cls([roads.coordinates[c] for c in names], names=names, leaf_size=leaf_size, metric=roads.metric_name)
+
+    def nearest_one(self, query):
+        """
+        Finds the point closest to a position
+        :param query: a point of the tree (see project)
+        :return: the position of the point in tree order and its squared euclidean distance
+        """
+        best, best_d2 = -1, np.inf
+        stack = [(0, 0.0)]  # <- (node, lower bound of the squared distance of its points)
+        while stack:
+            node, bound = stack.pop()
+            if bound >= best_d2:
+                continue
+            axis = self.axis[node]
+            if axis < 0:
+                lo, hi = self.lo[node], self.hi[node]
+                d2 = ((self.points[lo:hi] - query) ** 2).sum(axis=1)
+                i = int(np.argmin(d2))
+                if d2[i] < best_d2:
+                    best, best_d2 = lo + i, float(d2[i])
+                continue
+            diff = query[axis] - self.split[node]
+            near, far = (self.left[node], self.right[node]) if diff < 0 else (self.right[node], self.left[node])
+            # the near side is visited first
+            stack.append((far, max(bound, diff * diff)))
+            stack.append((near, bound))
+        return best, best_d2
+
+    def nearest(self, queries):
+        """
+        Snaps a batch of positions to their nearest point
+        :param queries: a list (or array) of (latitude, longitude) pairs
+        :return: the list of the names of the nearest points and the array of their distances in KM
+        """
+        names, chords = [], np.empty(len(queries))
+        for i, query in enumerate(self.project(queries)):
+            j, d2 = self.nearest_one(query)
+            names.append(self.names[self.order[j]])
+            chords[i] = np.sqrt(d2)
+        return names, self.to_distance(chords)
+
+    def within(self, queries, radius):
+        """
+        Finds, for a batch of positions, the points within a given distance
+        :param queries: a list (or array) of (latitude, longitude) pairs
+        :param radius: the distance in KM
+        :return: a list with the names of the points found for each position
+        """
+        r2 = self.to_chord(radius) ** 2
+        results = []
+        for query in self.project(queries):
+            found = []
+            stack = [0]
+            while stack:
+                node = stack.pop()
+                axis = self.axis[node]
+                if axis < 0:
+                    lo, hi = self.lo[node], self.hi[node]
+                    d2 = ((self.points[lo:hi] - query) ** 2).sum(axis=1)
+                    found.extend(self.order[lo:hi][d2 <= r2].tolist())
+                    continue
+                diff = query[axis] - self.split[node]
+                # a side is visited only if the ball around the position crosses it
+                if diff < 0 or diff * diff <= r2:
+                    stack.append(self.left[node])
+                if diff >= 0 or diff * diff <= r2:
+                    stack.append(self.right[node])
+            results.append([self.names[i] for i in found])
+        return results
@@ -1,4 +1,9 @@
+from array import array
+
+
 class Node:
+    __slots__ = ('state', 'parent', 'action', 'cost', 'depth')  # <- no per-node __dict__
+
     def __init__(self, state, parent, action, cost, depth):
         self.state = state
         self.parent = parent
@@ -39,3 +44,197 @@ class Node:
             node = node.parent
         path = list(reversed(path))
         return path
+
+
+class NodeArena:
+    """
+    A storage for the nodes of a search tree made of parallel arrays (state id, parent index, action id, cost, depth).
+    States and actions are interned, so that each distinct state or action is stored only once,
+    and the nodes refer to their parent by index instead of keeping it alive as an object.
+    """
+
+    def __init__(self, key=None):
+        self.key = key if key is not None else (lambda state: state)
+        self.states = []  # <- state id -> state
+        self.state_ids = {}  # <- state key -> state id
+        self.actions = []  # <- action id -> action
+        self.action_ids = {}  # <- action -> action id
+        self.state = array('i')
+        self.parent = array('i')
+        self.action = array('i')
+        self.cost = array('d')
+        self.depth = array('i')
+        self.cursor = ArenaNode(self, -1)  # <- handle reused to look at the nodes while ordering a fringe
+
+    def __len__(self):
+        return len(self.parent)
+
+    def intern_state(self, state):
+        k = self.key(state)
+        state_id = self.state_ids.get(k)
+        if state_id is None:
+            state_id = self.state_ids[k] = len(self.states)
+            self.states.append(state)
+        return state_id
+
+    def intern_action(self, action):
+        action_id = self.action_ids.get(action)
+        if action_id is None:
+            action_id = self.action_ids[action] = len(self.actions)
+            self.actions.append(action)
+        return action_id
+
+    def add(self, state, parent, action, cost, depth):
+        """
+        Stores a new node in the arena
+        :param state: state contained by the node
+        :param parent: index of the parent node (-1 for the root)
+        :param action: action that led to the state
+        :param cost: cost of the path from the root
+        :param depth: depth of the node
+        :return: the index of the node
+        """
+        self.state.append(self.intern_state(state))
+        self.parent.append(parent)
+        self.action.append(-1 if action is None else self.intern_action(action))
+        self.cost.append(cost)
+        self.depth.append(depth)
+        return len(self.parent) - 1
+
+    def truncate(self, size):
+        """
+        Removes the nodes from a given index on, so that their slots are reused (the states stay interned)
+        :param size: the number of nodes to keep
+        """
+        for values in (self.state, self.parent, self.action, self.cost, self.depth):
+            del values[size:]
+
+    def root(self, state):
+        return ArenaNode(self, self.add(state=state, parent=-1, action=None, cost=0, depth=0))
+
+    def view(self, index):
+        """
+        Returns a handle to a node that is only valid until the next call: no object is allocated per node
+        :param index: the index of the node
+        :return: the shared handle
+        """
+        self.cursor.index = index
+        return self.cursor
+
+
+class ArenaNode:
+    """
+    A lightweight handle to a node stored in a NodeArena. It offers the same interface of Node.
+    """
+    __slots__ = ('arena', 'index')
+
+    def __init__(self, arena, index):
+        self.arena = arena
+        self.index = index
+
+    def __repr__(self):
+        return f'({self.state})'
+
+    @property
+    def state(self):
+        return self.arena.states[self.arena.state[self.index]]
+
+    @property
+    def parent(self):
+        parent = self.arena.parent[self.index]
+        return None if parent < 0 else ArenaNode(self.arena, parent)
+
+    @property
+    def action(self):
+        action = self.arena.action[self.index]
+        return None if action < 0 else self.arena.actions[action]
+
+    @property
+    def cost(self):
+        return self.arena.cost[self.index]
+
+    @property
+    def depth(self):
+        return self.arena.depth[self.index]
+
+    def expand(self, state, action, cost=1):
+        """
+        Given a new state returns a child tree node containing that state
+        :param state: state that will be contained by the node
+        :param action: action that led to the state
+        :param cost: cost of the action
+        :return: a child node
+        """
+        return ArenaNode(self.arena, self.arena.add(state=state,
+                                                    parent=self.index,
+                                                    action=action,
+                                                    cost=self.arena.cost[self.index] + cost,
+                                                    depth=self.arena.depth[self.index] + 1))
+
+    def path(self):
+        """
+        Returns the path from the root node to the actual node walking the parent indices
+        :return: a list of actions
+        """
+        path = []
+        parents, actions = self.arena.parent, self.arena.action
+        index = self.index
+        while parents[index] >= 0:
+            path.append(self.arena.actions[actions[index]])
+            index = parents[index]
+        path = list(reversed(path))
+        return path
+
+
+def root_node(problem, arena=False):
+    """
+    Returns the root node of a search on a problem
+    :param problem: a search problem
+    :param arena: if True the nodes of the search are stored in a NodeArena
+    :return: a node containing the initial state
+    """
+    if arena:
+        return NodeArena(key=state_key(problem)).root(problem.initial_state)
+    return Node(state=problem.initial_state,
+                parent=None,
+                action=None,
+                cost=0,
+                depth=0)
+
+
+def rebuild(problem, actions, node=None):
+    """
+    Builds the chain of nodes reached applying a list of actions, e.g. to turn the solution found by a search that
+    does not work with nodes into a path
+    :param problem: a search problem
+    :param actions: a list of actions
+    :param node: the node the actions are applied from (the root node of the problem by default)
+    :return: the last node
+    """
+    if node is None:
+        node = root_node(problem)
+    for action in actions:
+        node = node.expand(state=problem.result(node.state, action),
+                           action=action,
+                           cost=problem.cost(node.state, action))
+    return node
+
+
+def surely_unreachable(problem):
+    """
+    Checks in advance if a search on a problem must fail, for the problems able to tell it cheaply
+    (e.g., when the goal lies in another connected component of a map)
+    :param problem: a search problem
+    :return: True if the goal state is surely unreachable, False otherwise
+    """
+    return hasattr(problem, 'reachable') and not problem.reachable()
+
+
+def state_key(problem):
+    """
+    Returns the function mapping the states of a problem to hashable keys.
+    Problems with unhashable states (e.g., lists) expose a key method, otherwise the state itself is the key.
+    :param problem: a search problem
+    :return: a function from a state to a hashable key
+    """
+    return getattr(problem, 'key', lambda state: state)
@@ -1,5 +1,6 @@
-import math
 import random
+import numpy as np
+from search.pattern_database import PatternDatabase, UNREACHED, additive
 
 
 class StreetProblem:
@@ -26,6 +27,15 @@ class StreetProblem:
         """
         return self.environment.streets[state]
 
+    def predecessors(self, state):
+        """
+        Given a state returns the states from which it can be reached with the respective actions.
+        The streets may be one-way, so they are found in the reversed streets of the map.
+        :param state: actual state
+        :return: list of predecessor states and actions
+        """
+        return [(s, state) for s in self.environment.reversed_streets()[state]]
+
     def result(self, state=None, action=None):
         """
         Given a state and an action returns the reached state
@@ -43,6 +53,13 @@ class StreetProblem:
         """
         return state == self.goal_state
 
+    def reachable(self):
+        """
+        Checks in advance if the goal state may be reached from the initial state
+        :return: False if the goal state is surely unreachable, True otherwise
+        """
+        return self.environment.connected(self.initial_state, self.goal_state)
+
     def cost(self, state, action):
         """
         Given a state and an action returns the cost of the action
@@ -59,11 +76,12 @@ class StreetProblem:
         :param state: a state
         :return: the heuristic value of the state
         """
-        lat_a, long_a = self.environment.coordinates[state]
-        lat_b, long_b = self.environment.coordinates[self.goal_state]
-        lat_diff = abs(lat_a - lat_b) * 111  # <- *111 to just convert the latitude distance in KM.
-        long_diff = abs(long_a - long_b) * 111  # <- *111 to just convert the longitude distance in KM.
-        return math.sqrt(lat_diff ** 2 + long_diff ** 2)
+        # straight distance from the goal, computed once per goal for all the cities
+        h = self.environment.heuristic(self.goal_state)[state]
+        if self.environment.landmarks:
+            # the landmark (ALT) lower bound is usually much tighter than the straight line
+            h = max(h, self.environment.landmark_bound(state, self.goal_state))
+        return h
 
 
 class MazeProblem:
@@ -88,32 +106,18 @@ class MazeProblem:
         :param state: actual state
         :return: a list of actions
         """
-        actionList = ['up', 'down', 'left', 'right']
-
-        # managing maze borders
-        if state[0] == 0:
-            actionList.remove("up")
-
-        if state[0] == self.environment.height - 1:
-            actionList.remove("down")
-
-        if state[1] == 0:
-            actionList.remove("left")
+        # the possible moves of each cell are looked up in the occupancy grid of the maze
+        return list(self.environment.actions(state))
 
-        if state[1] == self.environment.width - 1:
-            actionList.remove("right")
-
-        for i in range(self.environment.n_walls):
-            if (state[0] - 1, state[1]) == self.environment.p_walls[i]:
-                actionList.remove("up")
-            if (state[0] + 1, state[1]) == self.environment.p_walls[i]:
-                actionList.remove("down")
-            if (state[0], state[1] - 1) == self.environment.p_walls[i]:
-                actionList.remove("left")
-            if (state[0], state[1] + 1) == self.environment.p_walls[i]:
-                actionList.remove("right")
-
-        return actionList
+    def predecessors(self, state):
+        """
+        Given a state returns the states from which it can be reached with the respective actions.
+        The moves are reversible, so each neighbour reaches the state with the opposite move.
+        :param state: actual state
+        :return: list of predecessor states and actions
+        """
+        opposite = {'up': 'down', 'down': 'up', 'left': 'right', 'right': 'left'}
+        return [(self.result(state, a), opposite[a]) for a in self.actions(state)]
 
     def result(self, state=None, action=None):
         """
@@ -140,6 +144,13 @@ class MazeProblem:
         """
         return state == self.goal_state
 
+    def reachable(self):
+        """
+        Checks in advance if the goal state may be reached from the initial state
+        :return: False if the goal state is surely unreachable, True otherwise
+        """
+        return self.environment.connected(self.initial_state, self.goal_state)
+
     def cost(self, state, action):
         """
         Given a state and an action returns the cost of the action
@@ -258,6 +269,14 @@ class HanoiTower:
 
         return [rod_1, rod_2, rod_3]
 
+    def key(self, state):
+        """
+        Given a state returns a hashable representation of the state
+        :param state: a state
+        :return: a tuple of tuples
+        """
+        return tuple(tuple(rod) for rod in state)
+
     def goal_test(self, state):
         """
         Checks if the goal condition has been reached
@@ -284,6 +303,206 @@ class HanoiTower:
         return len(state[0]) + len(state[1])
 
 
+class CompactHanoiTower:
+    """
+    The tower of Hanoi with any number of pegs and a compact state: an integer with a base-k digit per disk, the
+    peg of the disk (disk 0 is the smallest). Moving a disk only adds a multiple of a power of k to the state, and
+    the state is its own hashable key.
+    The heuristic is a disjoint additive pattern database: the disks are split in groups and, since a move moves
+    the disk of a single group, the sum of the distances of the groups from their goal (each computed ignoring the
+    other disks) never overestimates the distance of the state.
+    """
+
+    def __init__(self, n, pegs=4, initial_state=None, goal_state=None, pattern_sizes=None, pattern_budget=2 ** 20):
+        self.n = n
+        self.pegs = pegs
+        self.powers = [pegs ** d for d in range(n + 1)]
+        if initial_state is None:
+            initial_state = 0  # <- all the disks on the first peg
+        if goal_state is None:
+            goal_state = self.powers[n] - 1  # <- every disk on the last peg: the digit pegs - 1 repeated n times
+        self.initial_state = initial_state
+        self.goal_state = goal_state
+        if pattern_sizes is None:
+            # patterns as large as possible with their database (a byte per abstract state) fitting the memory
+            # budget. With three pegs the distances (2^disks - 1) fit a byte only up to 7 disks.
+            largest = 1
+            while largest < min(n, 7 if pegs == 3 else n) and pegs ** (largest + 1) <= pattern_budget:
+                largest += 1
+            pattern_sizes = [largest] * (n // largest) + [n % largest]
+        if sum(pattern_sizes) != n:
+            raise ValueError('The pattern sizes must add up to the number of disks')
+        self.pattern_sizes = [size for size in pattern_sizes if size > 0]
+        self.databases = None  # <- a PatternDatabase for each pattern, built when needed
+        self.heuristic = None  # <- the sum of the pattern databases
+
+    def encode(self, rods):
+        """
+        Given the lists of disks of each peg (disks numbered from 1, smallest first) returns the compact state
+        :param rods: a list of lists, as in the states of HanoiTower
+        :return: an integer
+        """
+        return sum(peg * self.powers[disk - 1] for peg, rod in enumerate(rods) for disk in rod)
+
+    def decode(self, state):
+        """
+        Given a compact state returns the lists of disks of each peg (disks numbered from 1, smallest first)
+        :param state: an integer
+        :return: a list of lists, as in the states of HanoiTower
+        """
+        rods = [[] for _ in range(self.pegs)]
+        for disk in range(1, self.n + 1):
+            state, peg = divmod(state, self.pegs)
+            rods[peg].append(disk)
+        return rods
+
+    def tops(self, state, disks=None):
+        """
+        Returns the top disk of each peg: the smallest disk having the peg as digit
+        :param state: a state
+        :param disks: number of disks of the state
+        :return: a list with the top disk of each peg (None for an empty peg)
+        """
+        disks = self.n if disks is None else disks
+        tops = [None] * self.pegs
+        found = 0
+        for disk in range(disks):
+            state, peg = divmod(state, self.pegs)
+            if tops[peg] is None:
+                tops[peg] = disk
+                found += 1
+                if found == self.pegs:
+                    break
+        return tops
+
+    def successors(self, state):
+        """
+        Given a state returns the reachable states with the respective actions
+        :param state: actual state
+        :return: list of successor states and actions
+        """
+        tops = self.tops(state)
+        return [(state + (target - source) * self.powers[disk], (source, target))
+                for source, disk in enumerate(tops) if disk is not None
+                for target, other in enumerate(tops) if other is None or other > disk]
+
+    def actions(self, state):
+        """
+        Given a state returns the list of possible actions
+        :param state: actual state
+        :return: a list of (source peg, target peg) moves
+        """
+        return [a for _, a in self.successors(state)]
+
+    def result(self, state=None, action=None):
+        """
+        Given a state and an action returns the reached state
+        :param state: actual state
+        :param action: chosen action
+        :return: reached state
+        """
+        source, target = action
+        return state + (target - source) * self.powers[self.tops(state)[source]]
+
+    def goal_test(self, state):
+        """
+        Checks if the goal condition has been reached
+        :param state: actual state
+        :return: True if the goal condition is matched, False otherwise
+        """
+        return state == self.goal_state
+
+    def cost(self, state, action):
+        """
+        Returns the cost of an action. In this problem the cost is always unitary.
+        :param state: a state
+        :param action: an action
+        :return: a cost
+        """
+        return 1
+
+    def top_table(self, disks):
+        """
+        Tabulates the top disk of each peg for all the placements of a few disks
+        :param disks: number of disks
+        :return: an array (pegs, placements) of top disks, where disks means an empty peg
+        """
+        if disks == 0:
+            return np.zeros((self.pegs, 1), dtype=np.int64)
+        digits = np.arange(self.pegs ** disks)[:, None] // np.array(self.powers[:disks], dtype=np.int64) % self.pegs
+        return np.stack([np.where((digits == p).any(axis=1), (digits == p).argmax(axis=1), disks)
+                         for p in range(self.pegs)])
+
+    def pattern_distances(self, first, disks):
+        """
+        Computes the distances from the goal of all the placements of a group of consecutive disks, ignoring the
+        other ones, with a breadth first visit from the goal placement (moves are reversible).
+        It gives the same distances as PatternDatabase.build on the tower of the group (see pattern), but each
+        level of the visit is expanded at once with array operations: the top disks of a placement are looked up
+        in the tables of its lower and upper halves.
+        :param first: the smallest disk of the group
+        :param disks: the number of disks of the group
+        :return: an array of bytes indexed by the placement of the group (a state of the group alone)
+        """
+        powers = np.array(self.powers[:disks], dtype=np.int64)
+        low = disks // 2
+        low_tops, high_tops = self.top_table(low), self.top_table(disks - low) + low
+        distances = np.full(self.pegs ** disks, UNREACHED, dtype=np.uint8)
+        goal = self.goal_state // self.powers[first] % self.pegs ** disks
+        distances[goal] = 0
+        frontier = np.array([goal], dtype=np.int64)
+        depth = 0
+        while frontier.size:
+            depth += 1
+            for chunk in np.array_split(frontier, frontier.size // (1 << 20) + 1):
+                lower, upper = chunk % self.powers[low], chunk // self.powers[low]
+                tops = [np.where(low_tops[p][lower] < low, low_tops[p][lower], high_tops[p][upper])
+                        for p in range(self.pegs)]
+                for source in range(self.pegs):
+                    for target in range(self.pegs):
+                        if source != target:
+                            movable = tops[source] < tops[target]
+                            reached = chunk[movable] + (target - source) * powers[tops[source][movable]]
+                            reached = reached[distances[reached] == UNREACHED]
+                            if reached.size and depth == UNREACHED:
+                                raise ValueError('Pattern too large: its distances do not fit a byte')
+                            distances[reached] = depth
+            # at the depth marking the unreached placements no placement was reached (it would have raised)
+            frontier = np.flatnonzero(distances == depth) if depth < UNREACHED else frontier[:0]
+        return distances
+
+    def pattern(self, first, disks):
+        """
+        The abstraction keeping only a group of consecutive disks: the placement of the group is a state of the
+        tower made of the group alone
+        :param first: the smallest disk of the group
+        :param disks: the number of disks of the group
+        :return: the abstract problem (the tower of the group) and the function from a state to its placement
+        """
+        power, placements = self.powers[first], self.pegs ** disks
+        problem = CompactHanoiTower(disks, pegs=self.pegs, goal_state=self.goal_state // power % placements)
+        return problem, lambda state: state // power % placements
+
+    def build_databases(self):
+        self.databases = []
+        first = 0
+        for size in self.pattern_sizes:
+            _, abstraction = self.pattern(first, size)
+            self.databases.append(PatternDatabase(self.pattern_distances(first, size), abstraction))
+            first += size
+        self.heuristic = additive(*self.databases)
+
+    def h(self, state):
+        """
+        Given a state returns the heuristic value of the state
+        :param state: a state
+        :return: the heuristic value of the state
+        """
+        if self.databases is None:
+            self.build_databases()
+        return self.heuristic(state)
+
+
 class EightQueensProblem:
 
     def __init__(self, initial_state=None):
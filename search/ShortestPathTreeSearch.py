@@ -0,0 +1,37 @@
+from search.Node import rebuild
+from search.GraphSearch import GraphSearch
+from search.strategies import AStar
+
+
+class ShortestPathTreeSearch:
+    """
+    A class answering a StreetProblem by walking the shortest path tree of its goal, cached on the Roads map:
+    once the tree of a goal has been computed (a reverse Dijkstra search), every query towards the same goal
+    costs only the length of its path.
+    """
+
+    def __init__(self, problem, build=True):
+        self.problem = problem
+        self.build = build  # <- if False, a goal without a cached tree is solved by Graph Search with AStar
+
+    def __repr__(self):
+        return 'Shortest Path Tree Search'
+
+    def run(self):
+        """
+        Run the search
+        :return: a path or a failure
+        """
+        roads = self.problem.environment
+        tree = roads.goal_tree(self.problem.goal_state, build=self.build)
+        if tree is None:
+            return GraphSearch(problem=self.problem, strategy=AStar(self.problem)).run()
+
+        city = self.problem.initial_state
+        if city not in tree:
+            return 'Fail', []
+        cities = []
+        while not self.problem.goal_test(city):
+            city = tree[city]
+            cities.append(city)
+        return 'Ok', rebuild(self.problem, cities)
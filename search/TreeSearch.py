@@ -1,4 +1,5 @@
-from search.Node import Node
+from search.fringe import ArenaFringe
+from search.Node import root_node, surely_unreachable
 
 
 class TreeSearch:
@@ -6,10 +7,13 @@ class TreeSearch:
     A class able to find a solution with a given search strategy
     """
 
-    def __init__(self, problem, strategy=None):
+    def __init__(self, problem, strategy=None, arena=False):
         self.problem = problem
         self.strategy = strategy
-        self.fringe = []
+        self.arena = arena  # <- store the nodes in a NodeArena instead of separate objects
+        self.fringe = None
+        self.expanded = 0  # <- number of expanded nodes
+        self.max_fringe = 0  # <- peak size of the fringe
 
     def __repr__(self):
         return 'Tree Search'
@@ -19,12 +23,30 @@ class TreeSearch:
         Run the search
         :return: a path or a failure
         """
+        steps = self.steps()
+        try:
+            while True:
+                next(steps)
+        except StopIteration as stop:
+            return stop.value
 
-        node = Node(state=self.problem.initial_state,
-                    parent=None,
-                    action=None,
-                    cost=0,
-                    depth=0)
+    def steps(self, every=None):
+        """
+        Run the search a few expansions at a time: a generator pausing every given number of expanded nodes,
+        so that the search can be interleaved with other work (e.g., by an event loop)
+        :param every: number of expansions between two pauses (None to never pause)
+        :return: the path or the failure (as the value of the StopIteration)
+        """
+        if surely_unreachable(self.problem):
+            return 'Fail', []
+
+        node = root_node(self.problem, arena=self.arena)
+        self.fringe = self.strategy.fringe()
+        if self.arena:
+            # the fringe holds the indices of the nodes in the arena
+            self.fringe = ArenaFringe(self.fringe, node.arena)
+        self.expanded = 0
+        self.max_fringe = 0
 
         # search loop
         while True:
@@ -34,20 +56,21 @@ class TreeSearch:
 
             # expand the node
             new_states = self.problem.successors(node.state)
-            new_nodes = [node.expand(state=s,
-                                     action=a,
-                                     cost=self.problem.cost(node.state, a)) for s, a in new_states]
-
-            # update the fringe
-            self.fringe = self.fringe + new_nodes
+            self.expanded += 1
+            if every and self.expanded % every == 0:
+                yield
+            for s, a in new_states:
+                # update the fringe
+                self.fringe.push(node.expand(state=s,
+                                             action=a,
+                                             cost=self.problem.cost(node.state, a)))
+            self.max_fringe = max(self.max_fringe, len(self.fringe))
 
             # check if the search fails: empty fringe, unless the last node from the fringe contains the goal state
             # if the fringe is not empty, we pop the next node from the fringe according to the strategy
+            # (the fringe may also stay empty because it discards nodes, e.g., because of DepthLimited)
             if len(self.fringe) != 0:
-                self.fringe, node = self.strategy.select(self.fringe)
-                # check to manage if the fringe becomes empty within the strategy class (e.g., because of DepthLimited)
-                if node is None:
-                    return 'Fail', []
+                node = self.fringe.pop()
             else:
                 if self.problem.goal_test(node.state):
                     return 'Ok', node
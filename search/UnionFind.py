@@ -0,0 +1,45 @@
+class UnionFind:
+    """
+    Disjoint sets of the integers 0..n-1, merged with union by size and path halving
+    """
+
+    def __init__(self, n=0):
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def __len__(self):
+        return len(self.parent)
+
+    def add(self):
+        """
+        Adds a new singleton set
+        :return: the new element
+        """
+        self.parent.append(len(self.parent))
+        self.size.append(1)
+        return len(self.parent) - 1
+
+    def find(self, x):
+        """
+        Returns the representative of the set of an element
+        """
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, x, y):
+        """
+        Merges the sets of two elements
+        """
+        x, y = self.find(x), self.find(y)
+        if x == y:
+            return
+        if self.size[x] < self.size[y]:
+            x, y = y, x
+        self.parent[y] = x
+        self.size[x] += self.size[y]
+
+    def connected(self, x, y):
+        return self.find(x) == self.find(y)
@@ -0,0 +1,80 @@
+import numpy as np
+from search.Node import rebuild
+
+
+class WavefrontSearch:
+    """
+    A breadth first search for the MazeProblem computed with array operations on the occupancy grid of the maze:
+    each step moves the whole frontier (a wavefront) by one cell, so the distances of all the reachable cells
+    are obtained without expanding the nodes one by one.
+    """
+
+    def __init__(self, problem):
+        self.problem = problem
+        self.distances = None  # <- distance map from the initial state (-1: not reached)
+
+    def __repr__(self):
+        return 'Wavefront Search'
+
+    def distance_map(self, stop=None):
+        """
+        Computes the number of moves needed to reach each cell of the maze from the initial state
+        :param stop: a cell; if given, the wavefront stops as soon as it reaches it
+        :return: a matrix with the distance of each cell (-1 for the unreachable ones)
+        """
+        maze = self.problem.environment
+        height, width = maze.height, maze.width
+        free = (maze.grid == 1).ravel()
+        distances = np.full(height * width, -1, dtype=np.int64)
+
+        start = self.problem.initial_state[0] * width + self.problem.initial_state[1]
+        target = None if stop is None else stop[0] * width + stop[1]
+        if free[start]:
+            distances[start] = 0
+            frontier = np.array([start])
+            d = 0
+            while frontier.size != 0 and (target is None or distances[target] < 0):
+                cols = frontier % width
+                # the neighbours of the frontier: up, down, left, right
+                neighbours = np.concatenate([frontier[frontier >= width] - width,
+                                             frontier[frontier < (height - 1) * width] + width,
+                                             frontier[cols > 0] - 1,
+                                             frontier[cols < width - 1] + 1])
+                neighbours = np.unique(neighbours[free[neighbours] & (distances[neighbours] < 0)])
+                d += 1
+                distances[neighbours] = d
+                frontier = neighbours
+
+        return distances.reshape(height, width)
+
+    def path(self, distances, cell):
+        """
+        Walks the distance map back from a cell to the initial state
+        :param distances: the distance map
+        :param cell: a reached cell
+        :return: the list of actions from the initial state to the cell
+        """
+        height, width = distances.shape
+        path = []
+        while distances[cell] > 0:
+            for action, (dr, dc) in self.problem.environment.moves.items():
+                previous = (cell[0] - dr, cell[1] - dc)
+                if 0 <= previous[0] < height and 0 <= previous[1] < width \
+                        and distances[previous] == distances[cell] - 1:
+                    path.append(action)
+                    cell = previous
+                    break
+        path = list(reversed(path))
+        return path
+
+    def run(self):
+        """
+        Run the search
+        :return: a path or a failure
+        """
+        goal = self.problem.goal_state
+        self.distances = self.distance_map(stop=goal)
+        if self.distances[goal] < 0:
+            return 'Fail', []
+
+        return 'Ok', rebuild(self.problem, self.path(self.distances, goal))
@@ -0,0 +1,120 @@
+import multiprocessing
+import time
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+from search.CSRRoads import CSRRoads
+from search.GraphSearch import GraphSearch
+from search.Problems import StreetProblem
+from search.strategies import AStar
+
+worker = {}  # <- the map and the search of a worker process, set by attach
+
+
+def astar_search(problem):
+    return GraphSearch(problem=problem, strategy=AStar(problem))
+
+
+def attach(layout, metric, search):
+    """
+    Initializes a worker process: the arrays of the map are read from the shared memory blocks, without copies
+    :param layout: a (block name, shape, dtype) triple for each array of the CSRRoads map
+    :param metric: the name of the metric of the map
+    :param search: a function from a problem to the search answering it
+    """
+    blocks, arrays = [], []
+    for name, shape, dtype in layout:
+        block = SharedMemory(name=name)  # <- the block is owned (and eventually removed) by the parent process
+        blocks.append(block)
+        arrays.append(np.ndarray(shape, dtype=dtype, buffer=block.buf))
+    worker.update(roads=CSRRoads(*arrays, metric=metric), blocks=blocks, search=search)
+
+
+def route(query):
+    """
+    Answers a query in a worker process
+    :param query: an (initial city, goal city) pair of ids
+    :return: the result, the cities of the path, its cost and the seconds spent
+    """
+    start = time.perf_counter()
+    problem = StreetProblem(environment=worker['roads'],
+                            initial_state=query[0],
+                            goal_state=query[1])
+    result, node = worker['search'](problem).run()
+    if result != 'Ok':
+        return result, None, None, time.perf_counter() - start
+    return result, [query[0]] + node.path(), node.cost, time.perf_counter() - start
+
+
+class BatchRouter:
+    """
+    Answers large batches of StreetProblem queries with a pool of worker processes. The map is converted to a
+    CSRRoads and its arrays are copied once into shared memory, where every worker reads them: the tasks only
+    carry the two cities of a query. Identical queries of a batch are answered once.
+    """
+
+    def __init__(self, roads, processes=None, search=astar_search, chunksize=16):
+        if isinstance(roads, CSRRoads):
+            self.names = None
+        else:
+            roads, self.names = CSRRoads.from_roads(roads)
+        self.ids = {name: i for i, name in enumerate(self.names)} if self.names is not None else None
+        self.chunksize = chunksize
+
+        self.blocks, layout = [], []
+        for array in [roads.indptr, roads.indices, roads.weights, roads.points]:
+            array = np.ascontiguousarray(array)
+            block = SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            self.blocks.append(block)
+            layout.append((block.name, array.shape, array.dtype.str))
+        # the workers measure the straight distances (the heuristic) with the metric of the streets
+        self.pool = multiprocessing.Pool(processes, initializer=attach,
+                                         initargs=(layout, roads.metric_name, search))
+
+    def __repr__(self):
+        return 'Batch Router'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+        Stops the workers and releases the shared memory
+        """
+        self.pool.close()
+        self.pool.join()
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def map(self, queries):
+        """
+        Answers a batch of queries, yielding the answers in the order of the queries as soon as they are ready
+        :param queries: a list of (initial city, goal city) pairs
+        :return: a generator of (initial city, goal city, result, path, cost, seconds), where the path is the list
+        of the cities from the initial one to the goal and seconds is the time spent by the worker
+        """
+        # each distinct query is numbered in order of first appearance
+        unique, positions = {}, []
+        for query in queries:
+            positions.append(unique.setdefault(tuple(query), len(unique)))
+        tasks = list(unique)
+        if self.ids is not None:
+            tasks = [(self.ids[a], self.ids[b]) for a, b in tasks]
+
+        answers = []
+        i = 0
+        for answer in self.pool.imap(route, tasks, chunksize=self.chunksize):
+            result, path, cost, seconds = answer
+            if path is not None and self.names is not None:
+                path = [self.names[city] for city in path]
+            answers.append((result, path, cost, seconds))
+            # the answers of distinct queries arrive in order of first appearance, so every query whose
+            # distinct query has been answered can be yielded
+            while i < len(positions) and positions[i] < len(answers):
+                yield (*queries[i], *answers[positions[i]])
+                i += 1
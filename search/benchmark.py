@@ -0,0 +1,89 @@
+import json
+import platform
+import time
+import tracemalloc
+from search.Problems import MazeProblem
+from search.strategies import Random, BreadthFirst, DepthFirst, UniformCost, DepthLimitedSearch, Greedy, AStar
+from search.GraphSearch import GraphSearch
+from search.Environments import random_maze
+
+
+def all_strategies(problem, limit):
+    """
+    Returns an instance of every strategy of search.strategies
+    :param problem: the problem needed by the informed strategies
+    :param limit: the limit of the depth limited search
+    :return: a list of strategies
+    """
+    return [Random(), BreadthFirst(), DepthFirst(), UniformCost(), DepthLimitedSearch(limit=limit),
+            Greedy(problem), AStar(problem)]
+
+
+def measure(search, memory=True):
+    """
+    Runs a search, measuring time and (in a second run) the memory peak
+    :param search: a search algorithm exposing run, expanded and max_fringe
+    :param memory: if True the search is repeated while tracing the memory allocations
+    :return: a dictionary with the measures
+    """
+    start = time.perf_counter()
+    result, node = search.run()
+    seconds = time.perf_counter() - start
+    record = {'result': result,
+              'cost': node.cost if result == 'Ok' else None,
+              'seconds': seconds,
+              'expanded': search.expanded,
+              'max_fringe': search.max_fringe,
+              'peak_memory': None}
+    if memory:
+        # tracing slows the search down, so the time is measured in the first run only
+        tracemalloc.start()
+        search.run()
+        record['peak_memory'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return record
+
+
+def maze_benchmark(sizes, density=0.2, seed=0, engines=(GraphSearch,), memory=True):
+    """
+    Runs every strategy on random solvable square mazes of increasing size
+    :param sizes: the sizes of the mazes
+    :param density: fraction of the cells occupied by walls
+    :param seed: seed of the maze generator
+    :param engines: the search algorithms to use (TreeSearch may not terminate with some strategies)
+    :param memory: if True the memory peak is measured too
+    :return: a list of records, one for each (size, engine, strategy)
+    """
+    records = []
+    for size in sizes:
+        maze = random_maze(size, size, density, seed=seed)
+        problem = MazeProblem(environment=maze,
+                              initial_state=(0, 0),
+                              goal_state=(size - 1, size - 1))
+        for engine in engines:
+            for strategy in all_strategies(problem, limit=size * size):
+                search = engine(problem=problem, strategy=strategy)
+                record = {'size': size,
+                          'density': density,
+                          'walls': maze.n_walls,
+                          'engine': repr(search),
+                          'strategy': repr(strategy)}
+                record.update(measure(search, memory=memory))
+                records.append(record)
+    return records
+
+
+def save_report(records, path, **parameters):
+    """
+    Writes the records of a benchmark to a JSON file together with the parameters and the platform
+    :param records: the records of the benchmark
+    :param path: the output file
+    :param parameters: the parameters of the benchmark
+    """
+    report = {'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+              'python': platform.python_version(),
+              'machine': platform.machine(),
+              'parameters': parameters,
+              'records': records}
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
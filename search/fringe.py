@@ -0,0 +1,130 @@
+import heapq
+import random
+from collections import deque
+from search.Node import ArenaNode
+
+
+class FIFOFringe:
+    """
+    A first-in first-out fringe backed by a deque: push and pop are O(1)
+    """
+
+    def __init__(self):
+        self.nodes = deque()
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def push(self, node):
+        self.nodes.append(node)
+
+    def pop(self):
+        return self.nodes.popleft()
+
+
+class LIFOFringe:
+    """
+    A last-in first-out fringe (a stack): push and pop are O(1)
+    """
+    stack = True  # <- the nodes are popped in the reverse order of their pushes
+
+    def __init__(self):
+        self.nodes = []
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def push(self, node):
+        self.nodes.append(node)
+
+    def pop(self):
+        return self.nodes.pop()
+
+
+class DepthLimitedFringe(LIFOFringe):
+    """
+    A stack that discards the nodes deeper than a given limit as soon as they are pushed
+    """
+
+    def __init__(self, limit):
+        super().__init__()
+        self.limit = limit
+        self.arena = None  # <- the NodeArena of the pushed indices, if the fringe holds indices instead of nodes
+
+    def push(self, node):
+        depth = node.depth if self.arena is None else self.arena.depth[node]
+        if depth <= self.limit:
+            self.nodes.append(node)
+
+
+class RandomFringe(LIFOFringe):
+    """
+    A fringe returning a random node: the chosen node is swapped with the last one and popped in O(1)
+    """
+    stack = False
+
+    def pop(self):
+        i = random.randrange(len(self.nodes))
+        self.nodes[i], self.nodes[-1] = self.nodes[-1], self.nodes[i]
+        return self.nodes.pop()
+
+
+class PriorityFringe:
+    """
+    A binary heap ordered by an evaluation function of the nodes: push and pop are O(log n).
+    Ties are broken by insertion order, so that the node pushed first is popped first.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.nodes = []
+        self.counter = 0  # <- insertion counter used to break ties deterministically
+        self.arena = None  # <- the NodeArena of the pushed indices, if the fringe holds indices instead of nodes
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def push(self, node):
+        if self.arena is not None:
+            # the indices of an arena grow in insertion order, so they break the ties without a counter
+            heapq.heappush(self.nodes, (self.key(self.arena.view(node)), node))
+            return
+        heapq.heappush(self.nodes, (self.key(node), self.counter, node))
+        self.counter += 1
+
+    def pop(self):
+        return heapq.heappop(self.nodes)[-1]
+
+    def peek(self):
+        """
+        Returns the next node with its evaluation, without removing it from the fringe
+        :return: the evaluation and the node
+        """
+        return self.nodes[0][0], self.nodes[0][-1]
+
+
+class ArenaFringe:
+    """
+    Wraps the fringe of a strategy so that it holds the indices of nodes stored in a NodeArena instead of node
+    objects: a handle is created only for the node being expanded, and the fringe orders the indices looking at
+    the arena
+    """
+
+    def __init__(self, fringe, arena):
+        self.fringe = fringe
+        self.arena = arena
+        fringe.arena = arena
+
+    def __len__(self):
+        return len(self.fringe)
+
+    def push(self, node):
+        self.fringe.push(node.index)
+
+    def pop(self):
+        index = self.fringe.pop()
+        if getattr(self.fringe, 'stack', False):
+            # the nodes stored after the popped one have already been expanded (or discarded) together with their
+            # descendants, so their slots in the arena are reused
+            self.arena.truncate(index + 1)
+        return ArenaNode(self.arena, index)
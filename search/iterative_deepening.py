@@ -0,0 +1,122 @@
+import math
+from search.Node import root_node, state_key, surely_unreachable
+
+
+def depth_first(problem, bound, f):
+    """
+    A depth-first visit of the nodes whose evaluation does not exceed a bound.
+    Only the current path (and the successors of its nodes) is kept in memory, and states already on
+    the current path are not generated again.
+    :param problem: a search problem
+    :param bound: the maximum value of the evaluation function
+    :param f: the evaluation function of a node
+    :return: the goal node (or None), the minimum evaluation exceeding the bound, the number of expanded nodes
+    """
+    key = state_key(problem)
+    node = root_node(problem)
+    next_bound = math.inf
+
+    if f(node) > bound:
+        return None, f(node), 0
+    if problem.goal_test(node.state):
+        return node, next_bound, 0
+
+    on_path = {key(node.state)}
+    stack = [(node, iter(problem.successors(node.state)))]
+    expanded = 1
+    while stack:
+        node, children = stack[-1]
+        for s, a in children:
+            k = key(s)
+            if k in on_path:
+                continue
+            child = node.expand(state=s,
+                                action=a,
+                                cost=problem.cost(node.state, a))
+            value = f(child)
+            if value > bound:
+                # the node is cut off, but it tells which bound to try next
+                next_bound = min(next_bound, value)
+                continue
+            if problem.goal_test(s):
+                return child, next_bound, expanded
+            # go deeper
+            on_path.add(k)
+            stack.append((child, iter(problem.successors(s))))
+            expanded += 1
+            break
+        else:
+            # all the successors have been visited: backtrack
+            stack.pop()
+            on_path.discard(key(node.state))
+    return None, next_bound, expanded
+
+
+class IterativeDeepening:
+    """
+    Depth limited searches with an increasing limit, until a solution is found.
+    It uses memory linear in the depth of the solution.
+    """
+
+    def __init__(self, problem, max_depth=None):
+        self.problem = problem
+        self.max_depth = max_depth
+        self.iterations = []  # <- (limit, expanded nodes) for each iteration
+
+    def __repr__(self):
+        return 'Iterative Deepening Search'
+
+    def run(self):
+        """
+        Run the search
+        :return: a path or a failure
+        """
+        self.iterations = []
+        if surely_unreachable(self.problem):
+            return 'Fail', []
+        limit = 0
+        while self.max_depth is None or limit <= self.max_depth:
+            node, next_limit, expanded = depth_first(self.problem, limit, lambda x: x.depth)
+            self.iterations.append((limit, expanded))
+            if node is not None:
+                return 'Ok', node
+            # no node was cut off: the whole space has been explored
+            if next_limit == math.inf:
+                return 'Fail', []
+            limit = next_limit
+        return 'Fail', []
+
+
+class IDAStar:
+    """
+    Iterative deepening on the evaluation function of AStar (cost + heuristic): each iteration visits
+    depth-first the nodes within a threshold, which then grows to the smallest evaluation exceeding it.
+    """
+
+    def __init__(self, problem, max_threshold=None):
+        self.problem = problem
+        self.max_threshold = max_threshold
+        self.iterations = []  # <- (threshold, expanded nodes) for each iteration
+
+    def __repr__(self):
+        return 'IDA* Search'
+
+    def run(self):
+        """
+        Run the search
+        :return: a path or a failure
+        """
+        self.iterations = []
+        if surely_unreachable(self.problem):
+            return 'Fail', []
+        threshold = self.problem.h(self.problem.initial_state)
+        while self.max_threshold is None or threshold <= self.max_threshold:
+            node, next_threshold, expanded = depth_first(self.problem, threshold,
+                                                         lambda x: x.cost + self.problem.h(x.state))
+            self.iterations.append((threshold, expanded))
+            if node is not None:
+                return 'Ok', node
+            if next_threshold == math.inf:
+                return 'Fail', []
+            threshold = next_threshold
+        return 'Fail', []
@@ -0,0 +1,88 @@
+from collections import deque
+import numpy as np
+
+UNREACHED = 255  # <- value of the abstract states from which the goal cannot be reached
+
+
+class PatternDatabase:
+    """
+    The distances from the goal of all the states of an abstract (relaxed) state space, stored in an array of bytes
+    indexed by the abstract states. The distance of the abstraction of a state never exceeds the distance of the
+    state itself, so the database is an admissible heuristic: calling it on a state returns its value.
+    """
+
+    def __init__(self, distances, abstraction):
+        self.distances = distances
+        self.abstraction = abstraction  # <- function from a state to the index of its abstract state
+
+    def __repr__(self):
+        return f'Pattern Database ({len(self)} abstract states)'
+
+    def __len__(self):
+        return len(self.distances)
+
+    def __call__(self, state):
+        value = self.distances[self.abstraction(state)]
+        return float('inf') if value == UNREACHED else int(value)
+
+    @classmethod
+    def build(cls, problem, size, abstraction, rank=None):
+        """
+        Computes the distances with a breadth first visit from the goal of an abstract problem, following the
+        predecessors of the states (or their successors, when the moves are reversible). Actions have unit cost.
+        :param problem: the abstract problem, whose states are the abstract states
+        :param size: the number of abstract states
+        :param abstraction: a function from a state of the original problem to the index of its abstract state
+        :param rank: a function from an abstract state to its index in 0..size-1 (the state itself by default)
+        :return: a PatternDatabase
+        """
+        rank = rank if rank is not None else (lambda state: state)
+        expand = problem.predecessors if hasattr(problem, 'predecessors') else problem.successors
+        distances = np.full(size, UNREACHED, dtype=np.uint8)
+        distances[rank(problem.goal_state)] = 0
+        fringe = deque([(problem.goal_state, 0)])
+        while fringe:
+            state, depth = fringe.popleft()
+            for s, _ in expand(state):
+                i = rank(s)
+                if distances[i] == UNREACHED:
+                    if depth + 1 == UNREACHED:
+                        # a state is still to be reached, and its distance does not fit a byte
+                        raise ValueError('Abstract space too deep: its distances do not fit a byte')
+                    distances[i] = depth + 1
+                    fringe.append((s, depth + 1))
+        return cls(distances, abstraction)
+
+    def save(self, path):
+        """
+        Saves the distances in a NumPy (.npy) file
+        :param path: the path of the file
+        """
+        np.save(path, np.asarray(self.distances))
+
+    @classmethod
+    def load(cls, path, abstraction, mmap=True):
+        """
+        Loads the distances saved by save
+        :param path: the path of the file
+        :param abstraction: a function from a state to the index of its abstract state
+        :param mmap: if True the file is memory-mapped, so only the pages actually looked up are read
+        :return: a PatternDatabase
+        """
+        return cls(np.load(path, mmap_mode='r' if mmap else None), abstraction)
+
+
+def additive(*heuristics):
+    """
+    Sums some heuristics: admissible when no action is counted by two of them (e.g., disjoint patterns)
+    :return: a function from a state to its heuristic value
+    """
+    return lambda state: sum(h(state) for h in heuristics)
+
+
+def maximum(*heuristics):
+    """
+    Takes the largest value of some admissible heuristics, which is still admissible
+    :return: a function from a state to its heuristic value
+    """
+    return lambda state: max(h(state) for h in heuristics)
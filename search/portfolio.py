@@ -0,0 +1,108 @@
+import multiprocessing
+import queue
+import time
+from search.Node import rebuild
+
+
+def describe(search):
+    """
+    Names a search together with its strategy, if any
+    """
+    strategy = getattr(search, 'strategy', None)
+    return f'{strategy}, {search}' if strategy is not None else repr(search)
+
+
+def work(index, search, results):
+    """
+    Runs a search in a worker process and sends back its outcome. The solution is sent as the list of its
+    actions, which is much cheaper to pickle than the chain of its nodes.
+    :param index: the position of the search in the portfolio
+    :param search: a search algorithm exposing run
+    :param results: the queue collecting the outcomes
+    """
+    start = time.perf_counter()
+    try:
+        result, node = search.run()
+    except Exception as e:
+        results.put((index, 'Error', repr(e), None, time.perf_counter() - start))
+        return
+    if result == 'Ok':
+        results.put((index, result, node.path(), node.cost, time.perf_counter() - start))
+    else:
+        results.put((index, result, None, None, time.perf_counter() - start))
+
+
+class Portfolio:
+    """
+    Runs several searches of the same problem in parallel, one process each (e.g., GraphSearch and TreeSearch with
+    different strategies), and returns the first solution found or, with best=True, the cheapest solution found
+    within the deadline. The searches still running are then terminated, so the latency follows the fastest
+    search of each instance.
+    """
+
+    def __init__(self, searches, deadline=None, best=False):
+        self.searches = searches
+        self.problem = searches[0].problem
+        self.deadline = deadline  # <- seconds after which the running searches are terminated
+        self.best = best
+        self.winner = None  # <- the search whose solution is returned
+        self.reports = []  # <- (search, result, cost, seconds) of each search
+
+    def __repr__(self):
+        return 'Portfolio Search'
+
+    def run(self):
+        """
+        Run the searches
+        :return: a path or a failure
+        """
+        start = time.perf_counter()
+        results = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=work, args=(i, search, results), daemon=True)
+                     for i, search in enumerate(self.searches)]
+        for p in processes:
+            p.start()
+
+        outcomes = {}  # <- index -> (result, path, cost, seconds)
+        best = None  # <- index of the best solution
+        while len(outcomes) < len(processes):
+            timeout = 0.1  # <- the workers are polled, to notice the ones that die without sending their outcome
+            if self.deadline is not None:
+                remaining = self.deadline - (time.perf_counter() - start)
+                if remaining <= 0:
+                    break
+                timeout = min(timeout, remaining)
+            try:
+                index, result, path, cost, seconds = results.get(timeout=timeout)
+            except queue.Empty:
+                # a worker may be killed (e.g., when out of memory): once it has exited and the queue is empty,
+                # it is sure that no outcome is coming from it
+                exited = [i for i, p in enumerate(processes) if i not in outcomes and p.exitcode is not None]
+                if exited and results.empty():
+                    for i in exited:
+                        outcomes[i] = ('Error', f'exit code {processes[i].exitcode}', None,
+                                       time.perf_counter() - start)
+                continue
+            outcomes[index] = (result, path, cost, seconds)
+            if result == 'Ok' and (best is None or cost < outcomes[best][2]):
+                best = index
+                if not self.best:
+                    break
+
+        # cancel the searches still running
+        for p in processes:
+            if p.is_alive():
+                p.terminate()
+        for p in processes:
+            p.join()
+        results.close()
+
+        self.reports = []
+        for i, search in enumerate(self.searches):
+            result, _, cost, seconds = outcomes.get(i, ('Cancelled', None, None, None))
+            self.reports.append((describe(search), result, cost, seconds))
+        if best is None:
+            self.winner = None
+            return 'Fail', []
+        self.winner = self.searches[best]
+        return 'Ok', rebuild(self.problem, outcomes[best][1])
@@ -0,0 +1,119 @@
+import asyncio
+import inspect
+import math
+import time
+from search.Node import state_key
+
+
+def parameters(search):
+    """
+    Describes a search (or a strategy) by its type and the arguments it was built with, read from the attributes
+    with the same names: numbers, strings and None by value, strategies recursively and any other object (e.g., a
+    heuristic) by identity. The problem is left out, since it is described by the request.
+    :param search: a search algorithm or a strategy
+    :return: a hashable description
+    """
+    arguments = []
+    for name in inspect.signature(type(search)).parameters:
+        if name == 'problem' or not hasattr(search, name):
+            continue
+        value = getattr(search, name)
+        if name == 'strategy' and value is not None:
+            value = parameters(value)
+        elif not isinstance(value, (bool, int, float, str, type(None))):
+            value = ('id', id(value))
+        arguments.append((name, value))
+    return type(search).__module__, type(search).__qualname__, tuple(arguments)
+
+
+class SearchService:
+    """
+    An asyncio front-end for the search algorithms. The searches exposing steps (TreeSearch and GraphSearch) run in
+    the event loop, in time slices: they pause whenever a slice is over, so that the other requests are served
+    meanwhile. The other searches run in an executor. Each request may have a deadline, and concurrent identical
+    requests share a single computation, which is cancelled when no request is waiting for it anymore.
+    Deadlines and cancellations take effect at the next pause of the searches running in the event loop, so they
+    may be late by about a slice for each of them. A search running in an executor cannot be stopped and, holding
+    the GIL while it runs in a thread, also slows down the event loop: deadlines are best-effort.
+    """
+
+    def __init__(self, time_slice=0.001, every=16, executor=None):
+        self.time_slice = time_slice  # <- seconds a search running in the event loop runs before pausing
+        self.every = every  # <- expansions between two checks of the time slice
+        self.executor = executor  # <- executor of the searches without steps (None: the default one of the loop)
+        # key of a request -> [task computing it, number of waiting requests, time after which none of them waits]
+        self.computations = {}
+        self.requests = 0
+        self.coalesced = 0  # <- requests answered by a computation started by another request
+
+    def __repr__(self):
+        return 'Search Service'
+
+    @staticmethod
+    def request_key(search):
+        """
+        Returns the key identifying the requests with the same answer: same environment, initial state, goal state
+        and search (with the same strategy and parameters)
+        """
+        problem = search.problem
+        key = state_key(problem)
+        return (id(getattr(problem, 'environment', problem)), key(problem.initial_state),
+                key(getattr(problem, 'goal_state', None)), parameters(search))
+
+    async def compute(self, search, computation=None):
+        """
+        Runs a search without blocking the event loop
+        :param search: a search algorithm exposing run (and possibly steps)
+        :param computation: the entry of the computations shared by the requests, read at each pause to stop the
+        search once its deadline has passed (None to run the search to the end)
+        :return: a path or a failure
+        """
+        if hasattr(search, 'steps'):
+            steps = search.steps(every=self.every)
+            end = time.perf_counter() + self.time_slice
+            try:
+                while True:
+                    next(steps)
+                    if time.perf_counter() >= end:
+                        if computation is not None and time.perf_counter() >= computation[2]:
+                            raise asyncio.TimeoutError  # <- no request waits for the result anymore
+                        await asyncio.sleep(0)  # <- let the other tasks run
+                        end = time.perf_counter() + self.time_slice
+            except StopIteration as stop:
+                return stop.value
+        # a search running in an executor cannot be stopped: cancelling only stops waiting for it
+        return await asyncio.get_running_loop().run_in_executor(self.executor, search.run)
+
+    async def solve(self, search, deadline=None):
+        """
+        Answers a search request
+        :param search: a search algorithm exposing run (and possibly steps)
+        :param deadline: seconds after which the request fails with asyncio.TimeoutError (None for no deadline)
+        :return: a path or a failure
+        """
+        self.requests += 1
+        start = time.perf_counter()
+        end = math.inf if deadline is None else start + deadline
+        key = self.request_key(search)
+        computation = self.computations.get(key)
+        if computation is None:
+            computation = self.computations[key] = [None, 0, end]
+            computation[0] = asyncio.ensure_future(self.compute(search, computation))
+        else:
+            self.coalesced += 1
+            computation[2] = max(computation[2], end)
+        task = computation[0]
+        computation[1] += 1
+        try:
+            # the computation is shielded: a request timing out (or cancelled) does not cancel the other ones
+            result = await asyncio.wait_for(asyncio.shield(task), deadline)
+            if time.perf_counter() >= end:
+                raise asyncio.TimeoutError  # <- the result came, but too late
+            return result
+        finally:
+            computation[1] -= 1
+            if computation[1] == 0:
+                if self.computations.get(key) is computation:
+                    del self.computations[key]
+                if not task.done():
+                    task.cancel()
@@ -1,4 +1,4 @@
-import random
+from search.fringe import FIFOFringe, LIFOFringe, DepthLimitedFringe, RandomFringe, PriorityFringe
 
 
 class Random:
@@ -6,10 +6,8 @@ class Random:
         return 'Random strategy'
 
     @staticmethod
-    def select(fringe):
-        random.shuffle(fringe)
-        node = fringe.pop(0)
-        return fringe, node
+    def fringe():
+        return RandomFringe()
 
 
 class BreadthFirst:
@@ -17,9 +15,8 @@ class BreadthFirst:
         return 'Breadth First strategy'
 
     @staticmethod
-    def select(fringe):
-        node = fringe.pop(0)
-        return fringe, node
+    def fringe():
+        return FIFOFringe()
 
 
 class DepthFirst:
@@ -27,20 +24,19 @@ class DepthFirst:
         return 'Depth First strategy'
 
     @staticmethod
-    def select(fringe):
-        node = fringe.pop()
-        return fringe, node
+    def fringe():
+        return LIFOFringe()
 
 
 class UniformCost:
+    decrease_key = True  # <- graph search re-opens a state when a cheaper path to it is found
+
     def __repr__(self):
         return 'Uniform Cost strategy'
 
     @staticmethod
-    def select(fringe):
-        fringe = sorted(fringe, key=lambda x: x.cost)
-        node = fringe.pop(0)
-        return fringe, node
+    def fringe():
+        return PriorityFringe(key=lambda x: x.cost)
 
 
 class DepthLimitedSearch:
@@ -50,38 +46,41 @@ class DepthLimitedSearch:
     def __repr__(self):
         return 'Depth First Limited strategy'
 
-    def select(self, fringe):
-        fringe = [n for n in fringe if n.depth <= self.limit]
-        try:
-            node = fringe.pop()
-        except IndexError:
-            return [], None
-        return fringe, node
+    def fringe(self):
+        return DepthLimitedFringe(limit=self.limit)
 
 
 class Greedy:
-    def __init__(self, problem):
+    def __init__(self, problem, h=None):
         self.problem = problem
+        self.h = h  # <- heuristic replacing the one of the problem (e.g., a pattern database)
 
     def __repr__(self):
         return 'Greedy strategy'
 
-    def select(self, fringe):
-        # sort fringe following the evaluation function
-        fringe = sorted(fringe, key=lambda x: self.problem.h(x.state))
-        node = fringe.pop(0)
-        return fringe, node
+    def fringe(self):
+        h = self.problem.h if self.h is None else self.h
+        # order the fringe following the evaluation function
+        return PriorityFringe(key=lambda x: h(x.state))
 
 
 class AStar:
-    def __init__(self, problem):
+    decrease_key = True  # <- graph search re-opens a state when a cheaper path to it is found
+
+    def __init__(self, problem, h=None, weight=1):
         self.problem = problem
+        self.h = h  # <- heuristic replacing the one of the problem (e.g., a pattern database)
+        self.weight = weight  # <- weight of the heuristic: solutions cost at most weight times the optimal one
 
     def __repr__(self):
+        if self.weight != 1:
+            return f'Weighted AStar strategy (weight {self.weight})'
         return 'AStar strategy'
 
-    def select(self, fringe):
-        # sort fringe following the evaluation function
-        fringe = sorted(fringe, key=lambda x: (self.problem.h(x.state)+x.cost))
-        node = fringe.pop(0)
-        return fringe, node
+    def fringe(self):
+        h = self.problem.h if self.h is None else self.h
+        w = self.weight
+        # order the fringe following the evaluation function
+        if w == 1:
+            return PriorityFringe(key=lambda x: h(x.state) + x.cost)
+        return PriorityFringe(key=lambda x: w * h(x.state) + x.cost)